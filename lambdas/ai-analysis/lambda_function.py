@@ -1,43 +1,77 @@
 import json
 import boto3
 import base64
+import functools
+import hashlib
+import logging
 import os
-from typing import Dict, Any, List
+import re
+import time
+from boto3.dynamodb.conditions import Attr, Key
+from botocore.config import Config
+from dataclasses import dataclass, fields
+from typing import Dict, Any, Final, List, Optional, Sequence, Set, Tuple, Union
+
+logger = logging.getLogger()
+logger.setLevel(os.getenv("LOG_LEVEL", "INFO"))
+
+# Optional fast JSON encoder; falls back to stdlib json when not in the deployment package
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
+# Optional vectorized similarity for the semantic cache; falls back to a pure-Python dot product
+try:
+    import numpy
+except ImportError:  # pragma: no cover - numpy is optional
+    numpy = None
+
+# Bedrock Runtime client settings: keep-alive pooled connections and at most 2 attempts in
+# total; the streamed read timeout bounds the gap between chunks, so two attempts stay
+# inside the API Gateway 29s integration limit
+_BEDROCK_CLIENT_CONFIG: Final = Config(
+    region_name=os.environ.get('AWS_REGION') or os.environ.get('AWS_DEFAULT_REGION'),
+    retries={"total_max_attempts": 2, "mode": "adaptive"},
+    max_pool_connections=4,
+    tcp_keepalive=True,
+    connect_timeout=1.0,
+    read_timeout=8.0
+)
 
-# Initialize Bedrock Runtime client
-bedrock_runtime = boto3.client('bedrock-runtime', region_name=os.environ.get('AWS_DEFAULT_REGION'))
 ALLOWED_ORIGIN = os.environ.get('ALLOWED_ORIGIN', '*')
+BEDROCK_MODEL = os.environ.get('BEDROCK_MODEL', 'amazon.nova-lite-v1:0')
 
-def get_business_focused_prompt(change_type: str, ticket_summary: Dict[str, Any], policies: List[str]) -> List[Dict[str, Any]]:
-    """
-    Generate business-focused prompt templates based on change type.
-    Excludes system-enforced validation items and focuses on implementation requirements.
-    """
-    
-    # Extract language and copy details
-    language = ticket_summary.get('language', '')
-    copy_en = ticket_summary.get('copyEn', '').strip()
-    copy_zh = ticket_summary.get('copyZh', '').strip()
-    target_date = ticket_summary.get('targetLaunchDate', '')
-    
-    # Build language-specific copy information
-    copy_info = []
-    if copy_en:
-        copy_info.append(f"English copy: '{copy_en}'")
-    if copy_zh:
-        copy_info.append(f"Chinese copy: '{copy_zh}'")
-    
-    copy_details = " and ".join(copy_info) if copy_info else "Not provided"
-    
-    # Base business-focused instruction
-    base_instruction = f"""You are generating specific acceptance criteria for developers implementing this exact website change request.
+# Response headers, built once; the Lambda runtime only serializes them (must stay plain dicts)
+_JSON_CORS_HEADERS: Final = {
+    'Content-Type': 'application/json',
+    'Access-Control-Allow-Origin': ALLOWED_ORIGIN,
+    'Access-Control-Allow-Headers': 'Content-Type',
+    'Access-Control-Allow-Methods': 'POST, OPTIONS'
+}
+_UNAUTHORIZED_HEADERS: Final = {
+    **_JSON_CORS_HEADERS,
+    'Access-Control-Allow-Headers': 'Content-Type, Authorization',
+    'WWW-Authenticate': 'Bearer realm="API"'
+}
 
-ANALYZE THE SPECIFIC REQUEST DETAILS:
-- Page Area: {ticket_summary.get('pageArea', 'Not specified')}
-- Description: {ticket_summary.get('description', 'Not provided')}
-- Language Support: {language}
-- Copy Content: {copy_details}
-- Target Launch Date: {target_date or 'Not specified'}
+# Bedrock latency mode: "optimized" requires a model/inference profile that supports it
+# (e.g. us.anthropic.claude-3-5-haiku-20241022-v1:0); Nova Lite only runs "standard".
+BEDROCK_LATENCY_MODE = os.environ.get('BEDROCK_LATENCY_OPT', 'standard')
+# Bulk (non-interactive) analysis via Bedrock batch inference; unset disables the batch path
+BATCH_BUCKET = os.environ.get('BATCH_BUCKET', '')
+BATCH_ROLE_ARN = os.environ.get('BATCH_ROLE_ARN', '')
+# Bedrock rejects batch jobs below its per-job minimum record count; smaller sets run synchronously
+BATCH_MIN_RECORDS = int(os.environ.get('BATCH_MIN_RECORDS', '100'))
+# Semantic response cache (DynamoDB table keyed on changeType + promptHash); unset disables it
+SEMANTIC_CACHE_TABLE = os.environ.get('SEMANTIC_CACHE_TABLE', '')
+
+# Static prompt prefix shared by every invocation. Nothing here is interpolated so the
+# leading content blocks stay byte-identical across calls and can be served from the
+# Bedrock prompt cache (see the cachePoint in get_business_focused_prompt).
+STATIC_INSTRUCTION: Final = """You are generating specific acceptance criteria for developers implementing this exact website change request.
+
+ANALYZE THE SPECIFIC REQUEST DETAILS provided after these instructions (page area, description, language support, copy content, target launch date).
 
 GENERATE SPECIFIC CRITERIA based on the actual request content, NOT generic templates.
 
@@ -56,109 +90,9 @@ FOCUS ON SPECIFIC IMPLEMENTATION REQUIREMENTS for this exact request:
 - Target launch date considerations for implementation timeline
 - Language-specific display requirements if multiple languages provided
 
-IMPORTANT: Include ALL provided copy content (both English and Chinese if provided) in the acceptance criteria."""
-
-    # Change-type-specific focus areas
-    change_type_templates = {
-        "New Banner": {
-            "focus": f"Homepage hero banner implementation with bilingual Mid-Autumn Festival content",
-            "criteria_examples": [
-                "Homepage hero banner displays the English headline 'Mid-Autumn Festival Limited-time Offer' and Chinese headline '中秋限時優惠' as provided",
-                "Banner includes the English offer details '20% Off on All Products' and Chinese offer details '全場貨品8折' below the main headlines",
-                "Implementation uses the uploaded desktop banner (1920x1080) and mobile banner (1080x1350) assets",
-                "Banner update is deployed to homepage hero section and ready for October 1st, 2025 launch date",
-                f"Content placement and messaging align with the provided copy: {ticket_summary.get('copyEn', '') or ticket_summary.get('copyZh', '') or 'as provided'}",
-                f"Visual elements are appropriate for the {ticket_summary.get('pageArea', 'target page area')} context",
-                f"Implementation supports the {ticket_summary.get('targetLaunchDate', 'specified timeline')} launch requirements"
-            ]
-        },
-        "Content Update": {
-            "focus": "Content accuracy, brand voice alignment, localization, SEO considerations",
-            "criteria_examples": [
-                "Content aligns with brand voice and messaging guidelines",
-                "Copy is clear, benefit-focused, and avoids hype language",
-                "Localization maintains meaning and cultural appropriateness",
-                "Content updates support SEO objectives and user journey"
-            ]
-        },
-        "Bug Fix": {
-            "focus": "Expected behavior restoration, user experience improvements, compatibility",
-            "criteria_examples": [
-                "Issue is resolved and expected functionality is restored",
-                "User experience is improved without introducing new problems",
-                "Fix works consistently across different browsers and devices",
-                "Performance impact is minimal or positive"
-            ]
-        },
-        "New Feature": {
-            "focus": "Detailed feature specifications, user workflows, technical requirements, and business justification - requires comprehensive documentation",
-            "criteria_examples": [
-                "Feature specification requires detailed user workflow documentation and wireframes",
-                "Technical implementation approach and architecture needs detailed analysis",
-                "Business value proposition and success metrics must be clearly defined",
-                "Integration points with existing systems require comprehensive planning"
-            ]
-        },
-        "SEO Update": {
-            "focus": "Search optimization, content structure, technical SEO implementation",
-            "criteria_examples": [
-                "SEO improvements are implemented without breaking existing functionality",
-                "Content structure supports search engine understanding",
-                "Page performance is maintained or improved",
-                "User experience is enhanced alongside SEO benefits"
-            ]
-        }
-    }
-    
-    # Get template for specific change type or use generic
-    template = change_type_templates.get(change_type, {
-        "focus": "User experience, functionality, and business value",
-        "criteria_examples": [
-            "Implementation meets business requirements and user needs",
-            "Changes integrate well with existing functionality",
-            "User experience is maintained or improved"
-        ]
-    })
-    
-    # Check if this is a Mid-Autumn Festival campaign
-    is_mid_autumn = any(term in str(ticket_summary).lower() for term in [
-        'mid-autumn', 'mid autumn', 'moon festival', 'mooncake', '中秋'
-    ])
-    
-    # Check if this is a New Feature request (requires more scrutiny)
-    is_new_feature = change_type == "New Feature"
-    
-    # Build the prompt content
-    prompt_content = [
-        {"text": base_instruction},
-        {"text": f"Change Type Focus: {template['focus']}"},
-        {"text": f'Schema: {{"decision":"approve|reject","issues":[{{"field":"string","severity":"low|med|high","note":"string"}}],"acceptanceCriteria":["string"],"confidence":0.0}}'},
-        {"text": f"Request Details: {json.dumps(ticket_summary)}"},
-        {"text": f"Company Policies: {chr(10).join(policies)}"}
-    ]
-    
-    # Add Mid-Autumn Festival specific guidance if detected
-    if is_mid_autumn:
-        prompt_content.append({
-            "text": "SPECIAL NOTE: This appears to be a Mid-Autumn Festival campaign. Traditional illustrations and non-brand colors are ALLOWED per company policy. Do NOT flag brand guideline issues for seasonal traditional elements."
-        })
-    
-    # Add New Feature specific guidance (user-friendly approach)
-    if is_new_feature:
-        prompt_content.append({
-            "text": "NOTE: This is a NEW FEATURE request. Generate helpful acceptance criteria as usual. New features often benefit from:\n- User workflow specifications\n- Technical architecture documentation\n- Business justification and success metrics\n- Integration planning with existing systems\n- User experience wireframes or mockups\n\nGenerate acceptance criteria based on the provided information, and our system will add a friendly reminder about additional documentation that might be helpful."
-        })
-    
-    prompt_content.extend([
-        {"text": f"Context-Specific Examples for this {change_type} request:\n" + "\n".join([f"- {example}" for example in template['criteria_examples']])},
-        {"text": f"""Generate 3-4 SPECIFIC acceptance criteria for developers implementing THIS exact banner request.
+IMPORTANT: Include ALL provided copy content (both English and Chinese if provided) in the acceptance criteria.
 
-FOCUS ON THESE SPECIFIC IMPLEMENTATION DETAILS:
-1. Exact page location: {ticket_summary.get('pageArea', 'specified area')}
-2. Specific task: {ticket_summary.get('description', 'provided description')}
-3. Exact copy content to implement: {copy_details}
-4. Uploaded banner assets (desktop and mobile dimensions)
-5. Target deployment date: {target_date}
+WHEN GENERATING THE CRITERIA:
 
 FOR BILINGUAL CONTENT:
 - Specify both English and Chinese text exactly as provided
@@ -178,50 +112,394 @@ FOR NEW FEATURE REQUESTS:
 AVOID MENTIONING:
 - Brand guideline compliance (Mid-Autumn Festival seasonal campaigns are pre-approved)
 - Technical validation (alt text, file sizes, responsiveness - handled by system)
-- Generic design requirements
+- Generic design requirements"""
+
+# Change-type-specific focus areas
+_CHANGE_TYPE_TEMPLATES: Final = {
+    "New Banner": {
+        "focus": "Homepage hero banner implementation with bilingual Mid-Autumn Festival content",
+        "criteria_examples": (
+            "Homepage hero banner displays the English headline 'Mid-Autumn Festival Limited-time Offer' and Chinese headline '中秋限時優惠' as provided",
+            "Banner includes the English offer details '20% Off on All Products' and Chinese offer details '全場貨品8折' below the main headlines",
+            "Implementation uses the uploaded desktop banner (1920x1080) and mobile banner (1080x1350) assets",
+            "Banner update is deployed to homepage hero section and ready for October 1st, 2025 launch date"
+        )
+    },
+    "Content Update": {
+        "focus": "Content accuracy, brand voice alignment, localization, SEO considerations",
+        "criteria_examples": (
+            "Content aligns with brand voice and messaging guidelines",
+            "Copy is clear, benefit-focused, and avoids hype language",
+            "Localization maintains meaning and cultural appropriateness",
+            "Content updates support SEO objectives and user journey"
+        )
+    },
+    "Bug Fix": {
+        "focus": "Expected behavior restoration, user experience improvements, compatibility",
+        "criteria_examples": (
+            "Issue is resolved and expected functionality is restored",
+            "User experience is improved without introducing new problems",
+            "Fix works consistently across different browsers and devices",
+            "Performance impact is minimal or positive"
+        )
+    },
+    "New Feature": {
+        "focus": "Detailed feature specifications, user workflows, technical requirements, and business justification - requires comprehensive documentation",
+        "criteria_examples": (
+            "Feature specification requires detailed user workflow documentation and wireframes",
+            "Technical implementation approach and architecture needs detailed analysis",
+            "Business value proposition and success metrics must be clearly defined",
+            "Integration points with existing systems require comprehensive planning"
+        )
+    },
+    "SEO Update": {
+        "focus": "Search optimization, content structure, technical SEO implementation",
+        "criteria_examples": (
+            "SEO improvements are implemented without breaking existing functionality",
+            "Content structure supports search engine understanding",
+            "Page performance is maintained or improved",
+            "User experience is enhanced alongside SEO benefits"
+        )
+    }
+}
+
+_DEFAULT_CHANGE_TYPE_TEMPLATE: Final = {
+    "focus": "User experience, functionality, and business value",
+    "criteria_examples": (
+        "Implementation meets business requirements and user needs",
+        "Changes integrate well with existing functionality",
+        "User experience is maintained or improved"
+    )
+}
+
+# New Feature specific guidance (user-friendly approach)
+_NEW_FEATURE_GUIDANCE: Final = "NOTE: This is a NEW FEATURE request. Generate helpful acceptance criteria as usual. New features often benefit from:\n- User workflow specifications\n- Technical architecture documentation\n- Business justification and success metrics\n- Integration planning with existing systems\n- User experience wireframes or mockups\n\nGenerate acceptance criteria based on the provided information, and our system will add a friendly reminder about additional documentation that might be helpful."
+
+# New Feature reminder shown to requesters, and the (read-only) issue entries that carry it
+_NEW_FEATURE_NOTE: Final = "Note: New Feature requests typically require additional technical documentation and internal review before implementation. Consider providing user workflows, wireframes, and integration details for smoother development."
+_NEW_FEATURE_REVIEW_ISSUE: Final = {"field": "internal_review", "severity": "low", "note": _NEW_FEATURE_NOTE}
+_NEW_FEATURE_SUMMARY_ISSUE: Final = {"field": "summary_note", "severity": "info", "note": _NEW_FEATURE_NOTE}
+_NEW_FEATURE_ERROR_REVIEW_ISSUE: Final = {
+    "field": "internal_review",
+    "severity": "low",
+    "note": "Note: New Feature requests typically require additional technical documentation and internal review before implementation."
+}
+
+
+def _prompt_json(data: Dict[str, Any]) -> str:
+    """
+    Serialize request data for the prompt: compact, sorted keys and unescaped unicode,
+    so identical tickets always produce identical prompt bytes (and fewer tokens).
+    """
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_SORT_KEYS).decode()
+    return json.dumps(data, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+
+def _parse_body(body: Union[str, bytes]) -> Any:
+    """Parse the API Gateway request body (orjson when available)."""
+    if orjson is not None:
+        return orjson.loads(body)
+    return json.loads(body)
+
+def _request_body(event: Dict[str, Any]) -> Any:
+    """
+    Return the request payload: the decoded API Gateway body, or the event itself for
+    direct invocations. Base64-encoded bodies are decoded and empty bodies (warm-up
+    pings) skip parsing.
+    """
+    raw = event.get('body')
+    if raw is None:
+        return event
+    if isinstance(raw, (str, bytes, bytearray)):
+        if not raw:
+            return {}
+        if event.get('isBase64Encoded'):
+            raw = base64.b64decode(raw)
+        return _parse_body(raw)
+    return raw
+
+def _response_body(data: Any) -> str:
+    """Serialize an API Gateway response body; falls back to stdlib json for types orjson rejects."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(data).decode()
+        except TypeError:
+            pass
+    return json.dumps(data)
+
+def _strip_code_fence(text: str) -> str:
+    """
+    Remove a surrounding markdown code fence (```json ... ``` or ``` ... ```) from model output.
+    Fenced output is cut straight to the outermost JSON object, skipping the fence and any
+    language tag or trailing text in one slice.
+    """
+    text = text.strip()
+    if text[:3] != '```':
+        return text
+    start = text.find('{')
+    end = text.rfind('}')
+    if start != -1 and end > start:
+        return text[start:end + 1]
+    return text.removeprefix('```json').removeprefix('```').removesuffix('```').strip()
+
+def _build_change_type_block(change_type: str, template: Dict[str, Any]) -> str:
+    """Render the static focus/examples block for a change type."""
+    parts = [f"Change Type Focus: {template['focus']}"]
+    if change_type == "New Feature":
+        parts.append(_NEW_FEATURE_GUIDANCE)
+    parts.append(
+        f"Context-Specific Examples for this {change_type} request:\n"
+        + "\n".join([f"- {example}" for example in template['criteria_examples']])
+    )
+    return "\n\n".join(parts)
+
+
+# Second static block, keyed by change type (also lives before the cachePoint)
+STATIC_CHANGE_TYPE_BLOCK: Final = {
+    change_type: _build_change_type_block(change_type, template)
+    for change_type, template in _CHANGE_TYPE_TEMPLATES.items()
+}
 
-Generate specific, actionable criteria that tell developers exactly what to implement for THIS request."""}
-    ])
+# Mid-Autumn Festival campaign detection (only fields that can carry campaign wording)
+_MID_AUTUMN_RE: Final = re.compile(r"mid[- ]autumn|moon festival|mooncake|中秋", re.IGNORECASE)
+
+RESPONSE_SCHEMA: Final = 'Schema: {"decision":"approve|reject","issues":[{"field":"string","severity":"low|med|high","note":"string"}],"acceptanceCriteria":["string"],"confidence":0.0}'
+
+# Policy bullets (based on actual /policies directory)
+POLICIES: Final = (
+    "- Alt text is required for all marketing images (accessibility.md)",
+    "- Hero images: Desktop ≥1440px width, 600-800px height. Mobile ≥750px width, ~1000px height (performance.md)",
+    "- Image file size: Hero max 500KB, other images max 300KB (performance.md)",
+    "- Brand colors: Primary #5754FF, avoid off-palette colors except for banner images (brand.md)",
+    "- Voice: Clear, concise, benefit-first. Avoid hype words like 'FREE!!!' (brand.md)",
+    "- No ALL-CAPS headlines, use Title Case or Sentence case (brand.md)",
+    "- Buttons: One primary CTA per view, min 44px touch height (design-system.md)",
+    "- Mid-Autumn Festival exception: Traditional illustration and non-brand colors allowed for seasonal campaigns (brand.md)"
+)
+_POLICIES_TEXT: Final = "Company Policies: " + "\n".join(POLICIES)
+
+# Request-specific templates filled with str.format_map (placed after the cachePoint)
+_REQUEST_DETAILS_TEMPLATE: Final = """SPECIFIC REQUEST DETAILS:
+- Page Area: {pageArea}
+- Description: {description}
+- Language Support: {language}
+- Copy Content: {copyDetails}
+- Target Launch Date: {targetLaunchDate}"""
+
+_GENERATION_TEMPLATE: Final = """Generate 3-4 SPECIFIC acceptance criteria for developers implementing THIS exact banner request.
+
+FOCUS ON THESE SPECIFIC IMPLEMENTATION DETAILS:
+1. Exact page location: {pageLocation}
+2. Specific task: {task}
+3. Exact copy content to implement: {copyDetails}
+4. Uploaded banner assets (desktop and mobile dimensions)
+5. Target deployment date: {targetDate}
+
+Generate specific, actionable criteria that tell developers exactly what to implement for THIS request."""
+
+
+@dataclass(frozen=True, slots=True)
+class TicketSummary:
+    """The form fields sent to Nova Lite; missing form fields become empty values."""
+    requester_name: str = ''
+    change_type: str = ''
+    page_area: str = ''
+    description: str = ''
+    page_urls: Sequence[str] = ()
+    language: str = ''
+    target_launch_date: str = ''
+    department: str = ''
+    copy_en: str = ''
+    copy_zh: str = ''
+
+    @classmethod
+    def from_form_data(cls, form_data: Dict[str, Any]) -> "TicketSummary":
+        return cls(
+            requester_name=form_data.get('requesterName', ''),
+            change_type=form_data.get('changeType', ''),
+            page_area=form_data.get('pageArea', ''),
+            description=form_data.get('description', ''),
+            page_urls=form_data.get('pageUrls', []),
+            language=form_data.get('language', ''),
+            target_launch_date=form_data.get('targetLaunchDate', ''),
+            department=form_data.get('department', ''),
+            copy_en=form_data.get('copyEn', ''),
+            copy_zh=form_data.get('copyZh', '')
+        )
+
+    @classmethod
+    def of(cls, value: Union["TicketSummary", Dict[str, Any]]) -> "TicketSummary":
+        """Accept either a TicketSummary or a form-style dict (camelCase keys)."""
+        return value if isinstance(value, cls) else cls.from_form_data(value)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Form-style (camelCase) dict, as embedded in the prompt."""
+        return {
+            "requesterName": self.requester_name,
+            "changeType": self.change_type,
+            "pageArea": self.page_area,
+            "description": self.description,
+            "pageUrls": self.page_urls,
+            "language": self.language,
+            "targetLaunchDate": self.target_launch_date,
+            "department": self.department,
+            "copyEn": self.copy_en,
+            "copyZh": self.copy_zh
+        }
+
+@functools.lru_cache(maxsize=16)
+def _static_prompt_prefix(change_type: str, policies_text: str) -> Tuple[Dict[str, Any], ...]:
+    """
+    Content blocks up to and including the cachePoint, built once per change type.
+    The blocks are shared between calls and must not be mutated.
+    """
+    # Get static block for specific change type or build the generic one
+    change_type_block = STATIC_CHANGE_TYPE_BLOCK.get(change_type) or _build_change_type_block(
+        change_type, _DEFAULT_CHANGE_TYPE_TEMPLATE
+    )
+    return (
+        {"text": STATIC_INSTRUCTION},
+        {"text": RESPONSE_SCHEMA},
+        {"text": policies_text},
+        {"text": change_type_block},
+        {"cachePoint": {"type": "default"}}
+    )
+
+def get_business_focused_prompt(change_type: str, ticket_summary: Union[TicketSummary, Dict[str, Any]], policies: Sequence[str] = POLICIES) -> List[Dict[str, Any]]:
+    """
+    Generate business-focused prompt templates based on change type.
+    Excludes system-enforced validation items and focuses on implementation requirements.
+
+    The returned content is laid out as a static prefix (instructions, schema, policies,
+    change-type block) followed by a cachePoint and then the request-specific details,
+    so Bedrock can reuse the cached prefix across invocations. The content is also
+    suitable for latency-optimized inference (BEDROCK_LATENCY_OPT=optimized), which keeps
+    generation short by asking for 3-4 concise criteria.
+    """
+    
+    # Extract ticket fields once
+    ticket_summary = TicketSummary.of(ticket_summary)
+    page_area = ticket_summary.page_area
+    description = ticket_summary.description
+    language = ticket_summary.language
+    copy_en = ticket_summary.copy_en
+    copy_zh = ticket_summary.copy_zh
+    target_date = ticket_summary.target_launch_date
+    
+    # Build language-specific copy information
+    copy_info = []
+    if copy_en.strip():
+        copy_info.append(f"English copy: '{copy_en.strip()}'")
+    if copy_zh.strip():
+        copy_info.append(f"Chinese copy: '{copy_zh.strip()}'")
+    
+    copy_details = " and ".join(copy_info) if copy_info else "Not provided"
+    
+    # Check if this is a Mid-Autumn Festival campaign
+    is_mid_autumn = any(
+        _MID_AUTUMN_RE.search(str(value))
+        for value in (description, copy_en, copy_zh, page_area, ticket_summary.change_type)
+    )
+    
+    # The default policy block is joined once at import
+    policies_text = _POLICIES_TEXT if policies is POLICIES else "Company Policies: " + "\n".join(policies)
+    
+    # Fill values for the module-level templates
+    prompt_fields = {
+        'pageArea': page_area,
+        'description': description,
+        'language': language,
+        'copyDetails': copy_details,
+        'targetLaunchDate': target_date or 'Not specified',
+        'pageLocation': page_area,
+        'task': description,
+        'targetDate': target_date,
+    }
+    
+    # Static prefix first, then the cache marker; everything after it varies per request
+    prompt_content = [
+        *_static_prompt_prefix(change_type, policies_text),
+        {"text": _REQUEST_DETAILS_TEMPLATE.format_map(prompt_fields)},
+        {"text": f"Request Details: {_prompt_json(ticket_summary.to_dict())}"}
+    ]
+    
+    # Add Mid-Autumn Festival specific guidance if detected
+    if is_mid_autumn:
+        prompt_content.append({
+            "text": "SPECIAL NOTE: This appears to be a Mid-Autumn Festival campaign. Traditional illustrations and non-brand colors are ALLOWED per company policy. Do NOT flag brand guideline issues for seasonal traditional elements."
+        })
+    
+    # Request-specific examples for banners (depend on the ticket, so kept after the cachePoint)
+    if change_type == "New Banner":
+        prompt_content.append({"text": "Request-Specific Examples:\n" + "\n".join([
+            f"- Content placement and messaging align with the provided copy: {copy_en or copy_zh or 'as provided'}",
+            f"- Visual elements are appropriate for the {page_area} context",
+            f"- Implementation supports the {target_date} launch requirements"
+        ])})
+    
+    prompt_content.append({"text": _GENERATION_TEMPLATE.format_map(prompt_fields)})
     
     return prompt_content
 
+def _compile_substring_matcher(patterns: List[str]) -> "re.Pattern[str]":
+    """
+    Compile plain substrings into one alternation so a criterion is scanned once
+    instead of once per pattern. Matches exactly when any pattern is a substring.
+    The scan runs in the C regex engine, so the keyword checks built on this
+    (system-enforced filter, quality skip list, categorization) need no compiled
+    extension module.
+    """
+    return re.compile("|".join(re.escape(p) for p in patterns))
+
+
+# Patterns that should be completely removed (system handles these)
+_SYSTEM_ENFORCED_RE = _compile_substring_matcher([
+    "alt text",
+    "file size",
+    "image dimensions",
+    "dimension validation", 
+    "required field",
+    "form validation",
+    "upload validation",
+    "wcag guidelines",
+    "accessibility guidelines",
+    "mobile responsive",
+    "desktop and mobile",
+    "load quickly",
+    "page performance",
+    "call-to-action button",
+    "prominently placed"
+])
+
+@dataclass(frozen=True, slots=True)
+class Criterion:
+    """An acceptance criterion (stripped) paired with its lowercase form, computed once."""
+    text: str
+    lower: str
+
+    @classmethod
+    def of(cls, text: str) -> "Criterion":
+        text = text.strip()
+        return cls(text, text.lower())
+
 def filter_system_enforced_items(acceptance_criteria: List[str], change_type: str = '') -> List[str]:
     """
     Filter out system-enforced validation items from AI-generated acceptance criteria.
     Updated to properly handle alt text and other validation items.
     """
-    # Patterns that should be completely removed (system handles these)
-    system_enforced_patterns = [
-        "alt text",
-        "file size",
-        "image dimensions",
-        "dimension validation", 
-        "required field",
-        "form validation",
-        "upload validation",
-        "wcag guidelines",
-        "accessibility guidelines",
-        "mobile responsive",
-        "desktop and mobile",
-        "load quickly",
-        "page performance",
-        "call-to-action button",
-        "prominently placed"
-    ]
-    
+    return [criterion.text for criterion in _filter_system_enforced(acceptance_criteria)]
+
+def _filter_system_enforced(acceptance_criteria: List[str]) -> List[Criterion]:
+    """Pipeline form of filter_system_enforced_items; keeps the lowercase text for later stages."""
     filtered_criteria = []
     
-    for criterion in acceptance_criteria:
-        criterion = criterion.strip()
-        if not criterion:
+    for raw in acceptance_criteria:
+        criterion = Criterion.of(raw)
+        if not criterion.text:
             continue
-            
-        criterion_lower = criterion.lower()
         
         # Skip criteria that contain system-enforced patterns
-        is_system_enforced = any(pattern in criterion_lower for pattern in system_enforced_patterns)
-        
-        if not is_system_enforced:
+        if not _SYSTEM_ENFORCED_RE.search(criterion.lower):
             filtered_criteria.append(criterion)
     
     return filtered_criteria
@@ -273,6 +551,15 @@ def enhance_criteria_with_business_language(acceptance_criteria: List[str], chan
     
     return enhanced_criteria
 
+# Category keyword matchers, checked in priority order (first category hit wins)
+_CATEGORY_MATCHERS = (
+    ('accessibility', _compile_substring_matcher(['accessibility', 'accessible', 'screen reader', 'keyboard', 'contrast', 'alt text quality', 'aria'])),
+    ('performance', _compile_substring_matcher(['performance', 'load', 'speed', 'optimization', 'impact', 'quickly', 'efficient'])),
+    ('functionality', _compile_substring_matcher(['functionality', 'feature', 'interaction', 'workflow', 'integration', 'behavior', 'click', 'navigation', 'user action'])),
+    ('content', _compile_substring_matcher(['content', 'copy', 'text', 'messaging', 'brand voice', 'localization', 'seo', 'headline', 'description'])),
+    ('visual', _compile_substring_matcher(['display', 'layout', 'design', 'visual', 'hierarchy', 'placement', 'banner', 'image', 'color', 'font', 'responsive', 'mobile', 'desktop'])),
+)
+
 def categorize_acceptance_criterion(criterion: str) -> str:
     """
     Categorize acceptance criteria into business categories.
@@ -280,101 +567,78 @@ def categorize_acceptance_criterion(criterion: str) -> str:
     """
     criterion_lower = criterion.lower()
     
-    # Visual category keywords
-    visual_keywords = ['display', 'layout', 'design', 'visual', 'hierarchy', 'placement', 'banner', 'image', 'color', 'font', 'responsive', 'mobile', 'desktop']
-    
-    # Content category keywords  
-    content_keywords = ['content', 'copy', 'text', 'messaging', 'brand voice', 'localization', 'seo', 'headline', 'description']
-    
-    # Functionality category keywords
-    functionality_keywords = ['functionality', 'feature', 'interaction', 'workflow', 'integration', 'behavior', 'click', 'navigation', 'user action']
-    
-    # Performance category keywords
-    performance_keywords = ['performance', 'load', 'speed', 'optimization', 'impact', 'quickly', 'efficient']
-    
-    # Accessibility category keywords
-    accessibility_keywords = ['accessibility', 'accessible', 'screen reader', 'keyboard', 'contrast', 'alt text quality', 'aria']
-    
     # Check categories in priority order
-    if any(keyword in criterion_lower for keyword in accessibility_keywords):
-        return 'accessibility'
-    elif any(keyword in criterion_lower for keyword in performance_keywords):
-        return 'performance'
-    elif any(keyword in criterion_lower for keyword in functionality_keywords):
-        return 'functionality'
-    elif any(keyword in criterion_lower for keyword in content_keywords):
-        return 'content'
-    elif any(keyword in criterion_lower for keyword in visual_keywords):
-        return 'visual'
-    else:
-        return 'functionality'  # Default category
+    for category, matcher in _CATEGORY_MATCHERS:
+        if matcher.search(criterion_lower):
+            return category
+    
+    return 'functionality'  # Default category
+
+# Base technical to business transformations
+_BASE_TRANSFORMATIONS: Final = {
+    "alt text is provided": "Images enhance user understanding and are accessible to screen readers",
+    "alt text for images is provided": "Images enhance user understanding and are accessible to screen readers",
+    "image dimensions are acceptable": "Images display properly across all devices with responsive design",
+    "file size requirements": "Images load quickly without impacting page performance",
+    "desktop image dimensions": "Desktop layout displays images with proper visual hierarchy",
+    "mobile image dimensions": "Mobile layout provides optimal image viewing experience",
+    "form validation": "User input meets business requirements and data quality standards",
+    "required fields are completed": "All necessary business information is captured for implementation",
+    "dimensions are": "Images display effectively with proper responsive design",
+    "file size": "Images load quickly without impacting user experience",
+    "upload validation": "Content meets quality standards for user experience",
+    "field presence": "Required business information is available for implementation"
+}
+
+# Change-type-specific transformations
+_CHANGE_TYPE_TRANSFORMATIONS: Final = {
+    "New Banner": {
+        "image placement": "Banner images are positioned for maximum visual impact and user engagement",
+        "call to action": "Call-to-action elements drive user engagement and conversion",
+        "visual hierarchy": "Banner design guides user attention to key messaging and actions",
+        "brand compliance": "Banner aligns with brand guidelines and seasonal campaign requirements"
+    },
+    "Content Update": {
+        "content accuracy": "Content is accurate, up-to-date, and serves the intended user journey",
+        "brand voice": "Copy aligns with brand voice and messaging guidelines",
+        "localization": "Content maintains meaning and cultural appropriateness across languages",
+        "messaging": "Content effectively communicates value proposition to target audience"
+    },
+    "Bug Fix": {
+        "functionality": "Expected functionality is restored and works consistently",
+        "user experience": "User experience is improved without introducing new issues",
+        "compatibility": "Fix works reliably across different browsers and devices",
+        "behavior": "System behavior matches user expectations and business requirements"
+    },
+    "New Feature": {
+        "user interaction": "Feature provides intuitive user interactions that follow established patterns",
+        "integration": "Feature integrates seamlessly with existing user workflows",
+        "accessibility": "Feature meets accessibility standards for all users",
+        "workflow": "Feature enhances user productivity and business value"
+    },
+    "SEO Update": {
+        "search optimization": "SEO improvements enhance discoverability without breaking functionality",
+        "content structure": "Content structure supports search engine understanding and user navigation",
+        "technical seo": "Technical SEO implementation maintains optimal page performance",
+        "user experience": "SEO enhancements improve both search ranking and user experience"
+    }
+}
 
 def transform_to_business_language(technical_criterion: str, change_type: str = '') -> str:
     """
     Transform technical validation language to business requirements language.
     Enhanced with change-type-specific context and comprehensive mappings.
     """
-    
-    # Base technical to business transformations
-    base_transformations = {
-        "alt text is provided": "Images enhance user understanding and are accessible to screen readers",
-        "alt text for images is provided": "Images enhance user understanding and are accessible to screen readers",
-        "image dimensions are acceptable": "Images display properly across all devices with responsive design",
-        "file size requirements": "Images load quickly without impacting page performance",
-        "desktop image dimensions": "Desktop layout displays images with proper visual hierarchy",
-        "mobile image dimensions": "Mobile layout provides optimal image viewing experience",
-        "form validation": "User input meets business requirements and data quality standards",
-        "required fields are completed": "All necessary business information is captured for implementation",
-        "dimensions are": "Images display effectively with proper responsive design",
-        "file size": "Images load quickly without impacting user experience",
-        "upload validation": "Content meets quality standards for user experience",
-        "field presence": "Required business information is available for implementation"
-    }
-    
-    # Change-type-specific transformations
-    change_type_transformations = {
-        "New Banner": {
-            "image placement": "Banner images are positioned for maximum visual impact and user engagement",
-            "call to action": "Call-to-action elements drive user engagement and conversion",
-            "visual hierarchy": "Banner design guides user attention to key messaging and actions",
-            "brand compliance": "Banner aligns with brand guidelines and seasonal campaign requirements"
-        },
-        "Content Update": {
-            "content accuracy": "Content is accurate, up-to-date, and serves the intended user journey",
-            "brand voice": "Copy aligns with brand voice and messaging guidelines",
-            "localization": "Content maintains meaning and cultural appropriateness across languages",
-            "messaging": "Content effectively communicates value proposition to target audience"
-        },
-        "Bug Fix": {
-            "functionality": "Expected functionality is restored and works consistently",
-            "user experience": "User experience is improved without introducing new issues",
-            "compatibility": "Fix works reliably across different browsers and devices",
-            "behavior": "System behavior matches user expectations and business requirements"
-        },
-        "New Feature": {
-            "user interaction": "Feature provides intuitive user interactions that follow established patterns",
-            "integration": "Feature integrates seamlessly with existing user workflows",
-            "accessibility": "Feature meets accessibility standards for all users",
-            "workflow": "Feature enhances user productivity and business value"
-        },
-        "SEO Update": {
-            "search optimization": "SEO improvements enhance discoverability without breaking functionality",
-            "content structure": "Content structure supports search engine understanding and user navigation",
-            "technical seo": "Technical SEO implementation maintains optimal page performance",
-            "user experience": "SEO enhancements improve both search ranking and user experience"
-        }
-    }
-    
     criterion_lower = technical_criterion.lower()
     
     # First try change-type-specific transformations
-    if change_type in change_type_transformations:
-        for technical_phrase, business_phrase in change_type_transformations[change_type].items():
+    if change_type in _CHANGE_TYPE_TRANSFORMATIONS:
+        for technical_phrase, business_phrase in _CHANGE_TYPE_TRANSFORMATIONS[change_type].items():
             if technical_phrase in criterion_lower:
                 return business_phrase
     
     # Then try base transformations
-    for technical_phrase, business_phrase in base_transformations.items():
+    for technical_phrase, business_phrase in _BASE_TRANSFORMATIONS.items():
         if technical_phrase in criterion_lower:
             return business_phrase
     
@@ -390,38 +654,44 @@ def transform_to_business_language(technical_criterion: str, change_type: str =
     
     return technical_criterion
 
+# Business context and rationale per change type
+_BUSINESS_CONTEXT: Final = {
+    "New Banner": {
+        "context": "Banner effectiveness depends on visual impact, user engagement, and brand alignment",
+        "focus_areas": ("visual hierarchy", "call-to-action placement", "mobile responsiveness", "brand compliance")
+    },
+    "Content Update": {
+        "context": "Content updates must maintain brand voice while serving user journey objectives",
+        "focus_areas": ("brand voice alignment", "content accuracy", "localization quality", "SEO impact")
+    },
+    "Bug Fix": {
+        "context": "Bug fixes should restore expected functionality while improving overall user experience",
+        "focus_areas": ("functionality restoration", "user experience improvement", "cross-browser compatibility", "performance impact")
+    },
+    "New Feature": {
+        "context": "New features must integrate seamlessly while providing clear business value",
+        "focus_areas": ("user workflow integration", "interaction design", "accessibility compliance", "performance optimization")
+    },
+    "SEO Update": {
+        "context": "SEO improvements should enhance discoverability while maintaining user experience",
+        "focus_areas": ("search optimization", "content structure", "technical implementation", "user experience balance")
+    }
+}
+
+# First two words of each context sentence, used as the "(supports ...)" suffix
+_CONTEXT_PREFIX: Final = {
+    change_type: " ".join(info["context"].split(" ", 2)[:2]).lower()
+    for change_type, info in _BUSINESS_CONTEXT.items()
+}
+
 def add_business_context_by_change_type(criteria: List[str], change_type: str) -> List[str]:
     """
     Add business context and rationale to acceptance criteria based on change type.
     """
-    
-    business_context = {
-        "New Banner": {
-            "context": "Banner effectiveness depends on visual impact, user engagement, and brand alignment",
-            "focus_areas": ["visual hierarchy", "call-to-action placement", "mobile responsiveness", "brand compliance"]
-        },
-        "Content Update": {
-            "context": "Content updates must maintain brand voice while serving user journey objectives",
-            "focus_areas": ["brand voice alignment", "content accuracy", "localization quality", "SEO impact"]
-        },
-        "Bug Fix": {
-            "context": "Bug fixes should restore expected functionality while improving overall user experience",
-            "focus_areas": ["functionality restoration", "user experience improvement", "cross-browser compatibility", "performance impact"]
-        },
-        "New Feature": {
-            "context": "New features must integrate seamlessly while providing clear business value",
-            "focus_areas": ["user workflow integration", "interaction design", "accessibility compliance", "performance optimization"]
-        },
-        "SEO Update": {
-            "context": "SEO improvements should enhance discoverability while maintaining user experience",
-            "focus_areas": ["search optimization", "content structure", "technical implementation", "user experience balance"]
-        }
-    }
-    
-    if not criteria or change_type not in business_context:
+    if not criteria or change_type not in _BUSINESS_CONTEXT:
         return criteria
     
-    context_info = business_context[change_type]
+    context_prefix = _CONTEXT_PREFIX[change_type]
     enhanced_criteria = []
     
     for criterion in criteria:
@@ -429,7 +699,7 @@ def add_business_context_by_change_type(criteria: List[str], change_type: str) -
         if len(criterion.split()) < 8:  # Short criteria might need more context
             category = categorize_acceptance_criterion(criterion)
             if category in ['visual', 'content', 'functionality']:
-                enhanced_criterion = f"{criterion} (supports {context_info['context'].split(' ')[0].lower()} {context_info['context'].split(' ')[1].lower()})"
+                enhanced_criterion = f"{criterion} (supports {context_prefix})"
                 enhanced_criteria.append(enhanced_criterion)
             else:
                 enhanced_criteria.append(criterion)
@@ -444,56 +714,103 @@ def add_business_context_by_change_type(criteria: List[str], change_type: str) -
 # Removed complex validation functions to keep lambda lightweight and cost-effective
 # Only essential quality validation is kept in apply_quality_validation_and_fallback
 
-def apply_quality_validation_and_fallback(acceptance_criteria: List[str], change_type: str, ticket_summary: Dict[str, Any] = None) -> Dict[str, Any]:
+# System-enforced phrases dropped before deduplication
+_QUALITY_SKIP_RE = _compile_substring_matcher([
+    'alt text is provided', 'alt text for images', 'file size', 'dimension validation', 
+    'required field', 'form validation', 'upload validation'
+])
+
+# Filler words ignored when comparing criteria for duplicates
+_DEDUP_STOP_WORDS: Final = frozenset({'must', 'should', 'will', 'with', 'that', 'this', 'have'})
+
+def _jaccard_exceeds(words_a: Set[str], words_b: Set[str], threshold: float) -> bool:
+    """
+    Exact Jaccard similarity check (|A & B| / |A | B| > threshold).
+    Jaccard can never exceed min(|A|, |B|) / max(|A|, |B|), so pairs whose sizes are too
+    far apart are rejected without building the intersection; the union size is derived
+    from the intersection instead of materializing a second set.
+    """
+    len_a, len_b = len(words_a), len(words_b)
+    if not len_a or not len_b:
+        return False
+    if min(len_a, len_b) / max(len_a, len_b) <= threshold:
+        return False
+    shared = len(words_a & words_b)
+    return shared / (len_a + len_b - shared) > threshold
+
+@dataclass(frozen=True, slots=True)
+class QualityValidation:
+    """Quality metadata for validated criteria; fields left as None do not apply to the outcome."""
+    used_fallback: bool
+    reason: Optional[str] = None
+    quality_score: float = 0.0
+    total_criteria: Optional[int] = None
+    removed_duplicates: Optional[int] = None
+    salvaged_count: Optional[int] = None
+    fallback_count: Optional[int] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            field.name: getattr(self, field.name)
+            for field in fields(self)
+            if getattr(self, field.name) is not None
+        }
+
+@dataclass(frozen=True, slots=True)
+class QualityResult:
+    """Quality-validated acceptance criteria with their validation metadata."""
+    acceptance_criteria: List[str]
+    quality_validation: QualityValidation
+
+def apply_quality_validation_and_fallback(acceptance_criteria: List[str], change_type: str, ticket_summary: Union[TicketSummary, Dict[str, Any]] = None) -> Dict[str, Any]:
     """
     Apply lightweight quality validation with improved deduplication and quality checks.
     Optimized for minimal processing time and cost.
     """
+    result = _apply_quality_validation(
+        [Criterion.of(criterion) for criterion in acceptance_criteria], change_type, ticket_summary
+    )
+    return {
+        'acceptance_criteria': result.acceptance_criteria,
+        'quality_validation': result.quality_validation.to_dict()
+    }
+
+def _apply_quality_validation(acceptance_criteria: List[Criterion], change_type: str, ticket_summary: Union[TicketSummary, Dict[str, Any]] = None) -> QualityResult:
+    """Pipeline form of apply_quality_validation_and_fallback, working on pre-lowercased criteria."""
     if not acceptance_criteria:
         # No criteria provided, use fallback
         fallback_criteria = get_fallback_business_criteria(change_type, ticket_summary)
-        return {
-            'acceptance_criteria': fallback_criteria[:4],  # Limit to 4 criteria
-            'quality_validation': {
-                'used_fallback': True,
-                'reason': 'No criteria provided',
-                'quality_score': 0.0
-            }
-        }
+        return QualityResult(
+            fallback_criteria[:4],  # Limit to 4 criteria
+            QualityValidation(used_fallback=True, reason='No criteria provided', quality_score=0.0)
+        )
     
     # Clean and deduplicate criteria first
     cleaned_criteria = []
     seen_keywords = set()
     
     for criterion in acceptance_criteria:
-        criterion = criterion.strip()
-        if not criterion:
+        if not criterion.text:
             continue
             
-        criterion_lower = criterion.lower()
+        criterion_lower = criterion.lower
         
         # Skip system-enforced patterns entirely
-        if any(pattern in criterion_lower for pattern in [
-            'alt text is provided', 'alt text for images', 'file size', 'dimension validation', 
-            'required field', 'form validation', 'upload validation'
-        ]):
+        if _QUALITY_SKIP_RE.search(criterion_lower):
             continue
         
         # Extract key words for deduplication
-        key_words = set()
-        for word in criterion_lower.split():
-            if len(word) > 3 and word not in ['must', 'should', 'will', 'with', 'that', 'this', 'have']:
-                key_words.add(word)
+        key_words = {
+            word for word in criterion_lower.split()
+            if len(word) > 3 and word not in _DEDUP_STOP_WORDS
+        }
         
         # Check for significant overlap with existing criteria
         overlap_threshold = 0.6
-        is_duplicate = False
-        for existing_keywords in seen_keywords:
-            if key_words and existing_keywords:
-                overlap = len(key_words.intersection(existing_keywords)) / len(key_words.union(existing_keywords))
-                if overlap > overlap_threshold:
-                    is_duplicate = True
-                    break
+        is_duplicate = any(
+            _jaccard_exceeds(key_words, existing_keywords, overlap_threshold)
+            for existing_keywords in seen_keywords
+        )
         
         if not is_duplicate and key_words:
             cleaned_criteria.append(criterion)
@@ -501,15 +818,15 @@ def apply_quality_validation_and_fallback(acceptance_criteria: List[str], change
     
     # If we have good quality criteria, return them
     if len(cleaned_criteria) >= 3:
-        return {
-            'acceptance_criteria': cleaned_criteria[:5],  # Limit to 5 criteria
-            'quality_validation': {
-                'used_fallback': False,
-                'quality_score': 0.8,
-                'total_criteria': len(cleaned_criteria),
-                'removed_duplicates': len(acceptance_criteria) - len(cleaned_criteria)
-            }
-        }
+        return QualityResult(
+            [criterion.text for criterion in cleaned_criteria[:5]],  # Limit to 5 criteria
+            QualityValidation(
+                used_fallback=False,
+                quality_score=0.8,
+                total_criteria=len(cleaned_criteria),
+                removed_duplicates=len(acceptance_criteria) - len(cleaned_criteria)
+            )
+        )
     
     # If quality is poor, use fallback but try to keep 1-2 good original criteria
     fallback_criteria = get_fallback_business_criteria(change_type, ticket_summary)
@@ -517,9 +834,13 @@ def apply_quality_validation_and_fallback(acceptance_criteria: List[str], change
     # Combine best original with fallback, avoiding duplication
     final_criteria = []
     
+    # Word sets of the kept criteria, computed once and reused for every fallback check
+    final_words = []
+    
     # Add up to 2 best original criteria
     for criterion in cleaned_criteria[:2]:
-        final_criteria.append(criterion)
+        final_criteria.append(criterion.text)
+        final_words.append(set(criterion.lower.split()))
     
     # Add fallback criteria that don't duplicate existing ones
     for fallback in fallback_criteria:
@@ -527,69 +848,70 @@ def apply_quality_validation_and_fallback(acceptance_criteria: List[str], change
             break
             
         fallback_words = set(fallback.lower().split())
-        is_duplicate = False
         
-        for existing in final_criteria:
-            existing_words = set(existing.lower().split())
-            if fallback_words and existing_words:
-                overlap = len(fallback_words.intersection(existing_words)) / len(fallback_words.union(existing_words))
-                if overlap > 0.4:  # Lower threshold for fallback
-                    is_duplicate = True
-                    break
+        # Lower threshold for fallback
+        is_duplicate = any(_jaccard_exceeds(fallback_words, existing_words, 0.4) for existing_words in final_words)
         
         if not is_duplicate:
             final_criteria.append(fallback)
+            final_words.append(fallback_words)
     
-    return {
-        'acceptance_criteria': final_criteria,
-        'quality_validation': {
-            'used_fallback': True,
-            'reason': f'Insufficient quality criteria: {len(cleaned_criteria)} good criteria found',
-            'quality_score': len(cleaned_criteria) / max(1, len(acceptance_criteria)),
-            'salvaged_count': len(cleaned_criteria),
-            'fallback_count': len(final_criteria) - len(cleaned_criteria)
-        }
-    }
+    return QualityResult(
+        final_criteria,
+        QualityValidation(
+            used_fallback=True,
+            reason=f'Insufficient quality criteria: {len(cleaned_criteria)} good criteria found',
+            quality_score=len(cleaned_criteria) / max(1, len(acceptance_criteria)),
+            salvaged_count=len(cleaned_criteria),
+            fallback_count=len(final_criteria) - len(cleaned_criteria)
+        )
+    )
 
 # Removed similar_criterion function - not needed for lightweight implementation
 
-def generate_field_validation_fallback(ticket_summary: Dict[str, Any], change_type: str) -> Dict[str, Any]:
+# Field-validation outcome for a complete form
+_READY_FOR_REVIEW_ISSUE: Final = {"field": "general", "severity": "low", "note": "Form appears complete - ready for review"}
+
+def _required_field_issues(ticket_summary: TicketSummary, change_type: str) -> List[Dict[str, str]]:
     """
-    Generate proper field-by-field validation when AI response fails.
-    This provides the helpful missing information feedback like the mock data used to do.
+    Missing-field issues shared by every change type (plus the copy check for
+    New Banner / Content Update). An empty list means the form is complete.
     """
     issues = []
+    description = ticket_summary.description
+    copy_en = ticket_summary.copy_en.strip()
+    copy_zh = ticket_summary.copy_zh.strip()
+    page_urls = ticket_summary.page_urls
     
     # Check required fields and provide specific feedback
-    if not ticket_summary.get('requesterName', '').strip():
+    if not ticket_summary.requester_name.strip():
         issues.append({
             "field": "requesterName",
             "severity": "high",
             "note": "Requester name is required for ticket assignment and communication"
         })
     
-    if not ticket_summary.get('changeType', '').strip():
+    if not ticket_summary.change_type.strip():
         issues.append({
             "field": "changeType", 
             "severity": "high",
             "note": "Request type is required to determine review process and acceptance criteria"
         })
     
-    if not ticket_summary.get('pageArea', '').strip():
+    if not ticket_summary.page_area.strip():
         issues.append({
             "field": "pageArea",
             "severity": "high", 
             "note": "Impacted page area is required to understand implementation scope and impact"
         })
     
-    if not ticket_summary.get('description', '').strip():
+    if not description.strip():
         issues.append({
             "field": "description",
             "severity": "high",
             "note": "Description is required to understand what needs to be implemented"
         })
     
-    page_urls = ticket_summary.get('pageUrls', [])
     if not page_urls or not any(url.strip() for url in page_urls):
         issues.append({
             "field": "pageUrls",
@@ -597,7 +919,7 @@ def generate_field_validation_fallback(ticket_summary: Dict[str, Any], change_ty
             "note": "Impacted page URLs help developers understand the implementation context"
         })
     
-    if not ticket_summary.get('targetLaunchDate', '').strip():
+    if not ticket_summary.target_launch_date.strip():
         issues.append({
             "field": "targetLaunchDate",
             "severity": "high",
@@ -606,8 +928,6 @@ def generate_field_validation_fallback(ticket_summary: Dict[str, Any], change_ty
     
     # Change-type specific validation
     if change_type == "New Banner":
-        copy_en = ticket_summary.get('copyEn', '').strip()
-        copy_zh = ticket_summary.get('copyZh', '').strip()
         if not copy_en and not copy_zh:
             issues.append({
                 "field": "copy",
@@ -616,8 +936,6 @@ def generate_field_validation_fallback(ticket_summary: Dict[str, Any], change_ty
             })
     
     elif change_type == "Content Update":
-        copy_en = ticket_summary.get('copyEn', '').strip()
-        copy_zh = ticket_summary.get('copyZh', '').strip()
         if not copy_en and not copy_zh:
             issues.append({
                 "field": "copy",
@@ -625,8 +943,19 @@ def generate_field_validation_fallback(ticket_summary: Dict[str, Any], change_ty
                 "note": "Updated copy content is required for content change implementation"
             })
     
-    elif change_type == "New Feature":
-        if not ticket_summary.get('description', '').strip() or len(ticket_summary.get('description', '')) < 50:
+    return issues
+
+def generate_field_validation_fallback(ticket_summary: Union[TicketSummary, Dict[str, Any]], change_type: str) -> Dict[str, Any]:
+    """
+    Generate proper field-by-field validation when AI response fails.
+    This provides the helpful missing information feedback like the mock data used to do.
+    """
+    ticket_summary = TicketSummary.of(ticket_summary)
+    issues = _required_field_issues(ticket_summary, change_type)
+    
+    if change_type == "New Feature":
+        description = ticket_summary.description
+        if not description.strip() or len(description) < 50:
             issues.append({
                 "field": "description",
                 "severity": "high",
@@ -636,19 +965,11 @@ def generate_field_validation_fallback(ticket_summary: Dict[str, Any], change_ty
         # Only add the friendly reminder if there are other issues (incomplete form)
         # If form is complete, let normal AI analysis handle it and add reminder there
         if issues:  # Only add reminder if there are already validation issues
-            issues.append({
-                "field": "internal_review",
-                "severity": "low",
-                "note": "Note: New Feature requests typically require additional technical documentation and internal review before implementation. Consider providing user workflows, wireframes, and integration details for smoother development."
-            })
+            issues.append(_NEW_FEATURE_REVIEW_ISSUE)
     
     # If no issues found, don't add any issues for New Feature (let normal AI analysis handle it)
-    if not issues and change_type != "New Feature":
-        issues.append({
-            "field": "general",
-            "severity": "low", 
-            "note": "Form appears complete - ready for review"
-        })
+    elif not issues:
+        issues.append(_READY_FOR_REVIEW_ISSUE)
     
     # Generate appropriate fallback criteria
     fallback_criteria = get_fallback_business_criteria(change_type, ticket_summary)
@@ -664,65 +985,385 @@ def generate_field_validation_fallback(ticket_summary: Dict[str, Any], change_ty
         "confidence": 0.4
     }
 
-def get_fallback_business_criteria(change_type: str, ticket_summary: Dict[str, Any] = None) -> List[str]:
+# Fallback criteria per change type; New Banner is a template filled from the ticket
+_NEW_BANNER_FALLBACK_TEMPLATES: Final = (
+    "Implementation matches the specific requirements described: {description}",
+    "Banner is properly integrated into the {page_area} as specified",
+    "Visual design supports the campaign objectives outlined in the request",
+    "Content presentation aligns with the provided specifications and timeline"
+)
+
+_FALLBACK_CRITERIA: Final = {
+    "Content Update": (
+        "Content aligns with brand voice and messaging guidelines",
+        "Copy is clear, accurate, and effectively communicates intended message",
+        "Updates maintain consistency with existing site content and style",
+        "Localization maintains meaning and cultural appropriateness where applicable"
+    ),
+    "Bug Fix": (
+        "Issue is resolved and expected functionality is restored",
+        "Fix works consistently across different browsers and devices",
+        "User experience is improved without introducing new problems",
+        "Solution addresses root cause rather than just symptoms"
+    ),
+    "New Feature": (
+        "Feature specification requires detailed user workflow documentation and wireframes",
+        "Technical implementation approach and system architecture need comprehensive analysis",
+        "Business value proposition and measurable success criteria must be clearly defined",
+        "Integration points with existing systems require detailed planning and approval"
+    ),
+    "SEO Update": (
+        "SEO improvements are implemented without breaking existing functionality",
+        "Content structure supports search engine understanding",
+        "User experience is maintained or enhanced alongside SEO benefits",
+        "Technical SEO implementation follows current best practices"
+    )
+}
+
+_DEFAULT_FALLBACK_CRITERIA: Final = (
+    "Implementation meets business requirements and user needs",
+    "Changes integrate well with existing functionality and workflows",
+    "User experience is maintained or improved",
+    "Solution follows established design patterns and best practices"
+)
+
+def get_fallback_business_criteria(change_type: str, ticket_summary: Union[TicketSummary, Dict[str, Any]] = None) -> List[str]:
     """
     Provide fallback business-focused acceptance criteria when AI analysis fails.
     Updated to be more contextual to the specific request.
     """
-    if not ticket_summary:
-        ticket_summary = {}
-        
-    page_area = ticket_summary.get('pageArea', 'specified page area')
-    description = ticket_summary.get('description', 'described requirements')
-    
-    fallback_criteria = {
-        "New Banner": [
-            f"Implementation matches the specific requirements described: {description[:100]}{'...' if len(description) > 100 else ''}",
-            f"Banner is properly integrated into the {page_area} as specified",
-            f"Visual design supports the campaign objectives outlined in the request",
-            f"Content presentation aligns with the provided specifications and timeline"
-        ],
-        "Content Update": [
-            "Content aligns with brand voice and messaging guidelines",
-            "Copy is clear, accurate, and effectively communicates intended message",
-            "Updates maintain consistency with existing site content and style",
-            "Localization maintains meaning and cultural appropriateness where applicable"
-        ],
-        "Bug Fix": [
-            "Issue is resolved and expected functionality is restored",
-            "Fix works consistently across different browsers and devices",
-            "User experience is improved without introducing new problems",
-            "Solution addresses root cause rather than just symptoms"
-        ],
-        "New Feature": [
-            "Feature specification requires detailed user workflow documentation and wireframes",
-            "Technical implementation approach and system architecture need comprehensive analysis",
-            "Business value proposition and measurable success criteria must be clearly defined",
-            "Integration points with existing systems require detailed planning and approval"
-        ],
-        "SEO Update": [
-            "SEO improvements are implemented without breaking existing functionality",
-            "Content structure supports search engine understanding",
-            "User experience is maintained or enhanced alongside SEO benefits",
-            "Technical SEO implementation follows current best practices"
+    if ticket_summary:
+        ticket_summary = TicketSummary.of(ticket_summary)
+        page_area = ticket_summary.page_area
+        description = ticket_summary.description
+    else:
+        page_area = 'specified page area'
+        description = 'described requirements'
+    
+    if change_type == "New Banner":
+        return list(_banner_fallback_criteria(page_area, description))
+    return list(_FALLBACK_CRITERIA.get(change_type, _DEFAULT_FALLBACK_CRITERIA))
+
+@functools.lru_cache(maxsize=256)
+def _banner_fallback_criteria(page_area: str, description: str) -> Tuple[str, ...]:
+    """
+    Memoized New Banner fallback criteria keyed on the only ticket fields they depend on.
+    Returns an immutable tuple so cached entries can be shared safely between calls.
+    """
+    description_excerpt = description if len(description) <= 100 else f"{description[:100]}..."
+    return tuple(
+        template.format(description=description_excerpt, page_area=page_area)
+        for template in _NEW_BANNER_FALLBACK_TEMPLATES
+    )
+
+@functools.lru_cache(maxsize=None)
+def _get_bedrock() -> Any:
+    """Bedrock Runtime client, created on first use and reused across warm invocations."""
+    return boto3.client('bedrock-runtime', config=_BEDROCK_CLIENT_CONFIG)
+
+def _prime_for_first_request() -> None:
+    """
+    Do first-use work during the Lambda init phase (or SnapStart snapshot) instead of
+    on the first billable request: build the Bedrock client, resolve its endpoint and
+    warm the JSON codecs. Failures are ignored; the request path retries them lazily.
+    """
+    try:
+        _ = _get_bedrock().meta.endpoint_url
+        _response_body(_parse_body('{"warm":1}'))
+        _prompt_json({"warm": 1})
+    except Exception as err:
+        logger.warning("Init-time priming skipped: %s", err)
+
+# Only prime inside the Lambda runtime, so local imports stay side-effect free
+if os.environ.get('AWS_LAMBDA_FUNCTION_NAME'):
+    _prime_for_first_request()
+
+# Defaults for fields missing from the analysis; tuples so the shared values cannot be mutated
+_AI_DEFAULTS: Final = {"decision": "approve", "issues": (), "acceptanceCriteria": (), "confidence": 0.5}
+
+# Seconds kept free at the end of an invocation for the fallback response
+_RESPONSE_TIME_RESERVE: Final = 1.0
+
+def invoke_nova_lite(messages: List[Dict[str, Any]], deadline: Optional[float] = None) -> str:
+    """
+    Run a single Nova Lite converse call and return the response text.
+    Kept as the one place that talks to Bedrock so call options stay consistent.
+    The response is streamed (converse_stream) so text arrives as it is generated
+    and is assembled from the content deltas. When a time.monotonic() deadline is
+    given, generation that runs past it raises TimeoutError so the caller can fall
+    back before the Lambda itself times out.
+    """
+    request = {
+        "modelId": BEDROCK_MODEL,
+        "messages": messages,
+        "inferenceConfig": {
+            "maxTokens": 500,  # Increased to avoid truncation
+            "temperature": 0.2,
+            "topP": 0.9
+        }
+    }
+    # Top-level parameter; placing it in additionalModelRequestFields is rejected by Bedrock
+    if BEDROCK_LATENCY_MODE == "optimized":
+        request["performanceConfig"] = {"latency": "optimized"}
+    
+    response = _get_bedrock().converse_stream(**request)
+    
+    # Collect the text deltas of the first content block; the stream is read to the end
+    # (messageStop/metadata) so the pooled connection can be reused
+    chunks = []
+    for event in response['stream']:
+        delta = event.get('contentBlockDelta')
+        if delta:
+            if delta.get('contentBlockIndex', 0) == 0:
+                chunks.append(delta['delta'].get('text', ''))
+            if deadline is not None and time.monotonic() > deadline:
+                response['stream'].close()
+                raise TimeoutError('Nova Lite response exceeded the invocation time budget')
+        elif 'messageStop' in event and event['messageStop'].get('stopReason') == 'max_tokens':
+            # Truncated JSON will not parse; the caller's malformed-response fallback applies
+            logger.warning('Nova Lite response truncated at maxTokens')
+    return ''.join(chunks)
+
+# Semantic cache settings: Titan v2 embeddings are unit-normalized, so cosine is a dot product
+_EMBEDDING_MODEL: Final = 'amazon.titan-embed-text-v2:0'
+_EMBEDDING_DIMENSIONS: Final = 512
+_SEMANTIC_CACHE_THRESHOLD: Final = 0.92
+# Corpus bounds: entries carry an expiresAt epoch (enable DynamoDB TTL on it) and at most the
+# newest SEMANTIC_CACHE_MAX_ENTRIES per change type are kept in memory and compared
+_SEMANTIC_CACHE_TTL_SECONDS: Final = int(os.environ.get('SEMANTIC_CACHE_TTL_DAYS', '30')) * 86400
+_SEMANTIC_CACHE_MAX_ENTRIES: Final = int(os.environ.get('SEMANTIC_CACHE_MAX_ENTRIES', '500'))
+
+# Warm-container copy of the cache: change_type -> [(prompt_hash, embedding, response_text)],
+# oldest first; only change types that loaded completely are present
+_semantic_entries: Dict[str, List[Tuple[str, List[float], str]]] = {}
+# change_type -> numpy matrix of the entries' embeddings (rebuilt after a store)
+_semantic_matrices: Dict[str, Any] = {}
+
+@functools.lru_cache(maxsize=None)
+def _semantic_cache_table() -> Any:
+    """DynamoDB table for the semantic cache, only created when the cache is enabled."""
+    return boto3.resource('dynamodb', region_name=os.environ.get('AWS_DEFAULT_REGION')).Table(SEMANTIC_CACHE_TABLE)
+
+def _request_prompt_text(messages: List[Dict[str, Any]]) -> str:
+    """The request-specific prompt text (everything after the cachePoint, plus images)."""
+    content = messages[0]["content"]
+    start = next((i + 1 for i, block in enumerate(content) if "cachePoint" in block), 0)
+    return "\n".join(block["text"] for block in content[start:] if "text" in block)
+
+def _embed_text(text: str) -> List[float]:
+    """Embed prompt text with Titan Text Embeddings v2 (normalized vectors)."""
+    response = _get_bedrock().invoke_model(
+        modelId=_EMBEDDING_MODEL,
+        body=json.dumps({"inputText": text, "dimensions": _EMBEDDING_DIMENSIONS, "normalize": True})
+    )
+    return json.loads(response['body'].read())['embedding']
+
+def _semantic_entries_for(change_type: str) -> List[Tuple[str, List[float], str]]:
+    """Load the unexpired cached entries for one change type from DynamoDB once per container."""
+    entries = _semantic_entries.get(change_type)
+    if entries is None:
+        items = []
+        query = {
+            'KeyConditionExpression': Key('changeType').eq(change_type),
+            'FilterExpression': Attr('expiresAt').gt(int(time.time()))
+        }
+        while True:
+            page = _semantic_cache_table().query(**query)
+            items.extend(page.get('Items', []))
+            if 'LastEvaluatedKey' not in page:
+                break
+            query['ExclusiveStartKey'] = page['LastEvaluatedKey']
+        items.sort(key=lambda item: item.get('createdAt', 0))
+        entries = [
+            (item['promptHash'], json.loads(item['embedding']), item['response'])
+            for item in items[-_SEMANTIC_CACHE_MAX_ENTRIES:]
         ]
+        _semantic_entries[change_type] = entries
+    return entries
+
+def _best_semantic_match(change_type: str, entries: List[Tuple[str, List[float], str]],
+                         embedding: List[float]) -> Tuple[float, Optional[str]]:
+    """Highest dot-product score among the cached entries and its response."""
+    if not entries:
+        return 0.0, None
+    if numpy is not None:
+        matrix = _semantic_matrices.get(change_type)
+        if matrix is None:
+            matrix = _semantic_matrices[change_type] = numpy.array([entry[1] for entry in entries], dtype=numpy.float32)
+        scores = matrix @ numpy.asarray(embedding, dtype=numpy.float32)
+        best = int(scores.argmax())
+        return float(scores[best]), entries[best][2]
+    best_score, best_response = 0.0, None
+    for _, cached_embedding, cached_response in entries:
+        score = sum(a * b for a, b in zip(embedding, cached_embedding))
+        if score > best_score:
+            best_score, best_response = score, cached_response
+    return best_score, best_response
+
+def semantic_cache_lookup(change_type: str, messages: List[Dict[str, Any]]) -> Tuple[str, Optional[List[float]], Optional[str]]:
+    """
+    Look up a prior response for an equivalent prompt of the same change type.
+    An exact prompt hash match skips the embedding call; otherwise the prompt is embedded
+    and the best cached vector above _SEMANTIC_CACHE_THRESHOLD is used.
+    Returns (prompt_hash, embedding, cached_response); cache errors are treated as misses.
+    """
+    prompt_text = _request_prompt_text(messages)
+    prompt_hash = hashlib.sha256(prompt_text.encode('utf-8')).hexdigest()
+    try:
+        entries = _semantic_entries_for(change_type)
+        for cached_hash, _, cached_response in entries:
+            if cached_hash == prompt_hash:
+                return prompt_hash, None, cached_response
+        
+        embedding = _embed_text(prompt_text)
+        best_score, best_response = _best_semantic_match(change_type, entries, embedding)
+        if best_score > _SEMANTIC_CACHE_THRESHOLD:
+            logger.info("Semantic cache hit for %s (score=%.3f)", change_type, best_score)
+            return prompt_hash, None, best_response
+        return prompt_hash, embedding, None
+    except Exception as err:
+        logger.warning("Semantic cache lookup failed, calling Bedrock: %s", err)
+        return prompt_hash, None, None
+
+def semantic_cache_store(change_type: str, prompt_hash: str, embedding: List[float], response_text: str) -> None:
+    """Persist a successfully parsed model response for later semantic lookups."""
+    now = int(time.time())
+    try:
+        _semantic_cache_table().put_item(Item={
+            'changeType': change_type,
+            'promptHash': prompt_hash,
+            'embedding': json.dumps(embedding),
+            'response': response_text,
+            'createdAt': now,
+            'expiresAt': now + _SEMANTIC_CACHE_TTL_SECONDS
+        })
+    except Exception as err:
+        logger.warning("Semantic cache store failed: %s", err)
+        return
+    # A change type whose load failed stays absent, so the next lookup reloads it in full
+    entries = _semantic_entries.get(change_type)
+    if entries is not None:
+        entries.append((prompt_hash, embedding, response_text))
+        del entries[:-_SEMANTIC_CACHE_MAX_ENTRIES]
+        _semantic_matrices.pop(change_type, None)
+
+@functools.lru_cache(maxsize=None)
+def _batch_clients() -> Tuple[Any, Any]:
+    """S3 and Bedrock control-plane clients, only created when the batch path is used."""
+    region = os.environ.get('AWS_DEFAULT_REGION')
+    return boto3.client('s3', region_name=region), boto3.client('bedrock', region_name=region)
+
+def _batch_record(record_id: str, messages: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Build one batch inference JSONL record in the Nova native (InvokeModel) format.
+    cachePoint markers are dropped: batch jobs do not use the prompt cache.
+    """
+    return {
+        "recordId": record_id,
+        "modelInput": {
+            "schemaVersion": "messages-v1",
+            "messages": [
+                {"role": message["role"], "content": [block for block in message["content"] if "text" in block]}
+                for message in messages
+            ],
+            "inferenceConfig": {
+                "max_new_tokens": 500,
+                "temperature": 0.2,
+                "top_p": 0.9
+            }
+        }
     }
+
+def analyze_tickets_batch(tickets: List[Dict[str, Any]], policies: Sequence[str] = POLICIES) -> Dict[str, Any]:
+    """
+    Bulk entry path for queued tickets (e.g. overnight SLA review).
+    Tickets marked priority "urgent" still go through the synchronous converse call;
+    the rest are written as one JSONL file to S3 and submitted as a single Bedrock
+    batch inference job. Fewer than BATCH_MIN_RECORDS deferrable tickets, or a failed
+    submission, fall back to the synchronous call for those tickets.
+    Returns the job handle (or None) and the synchronous responses keyed by record id.
+
+    Scaffolding: no handler calls this yet and nothing consumes batch-output/.
+    """
+    sync_results = {}
+    deferred = []
+    for index, ticket in enumerate(tickets):
+        record_id = str(ticket.get('ticketId') or f"ticket-{index:05d}")
+        messages = [{
+            "role": "user",
+            "content": get_business_focused_prompt(ticket.get('changeType', ''), ticket, policies)
+        }]
+        if ticket.get('priority') == 'urgent' or not (BATCH_BUCKET and BATCH_ROLE_ARN):
+            sync_results[record_id] = invoke_nova_lite(messages)
+        else:
+            deferred.append((record_id, messages))
     
-    base_criteria = fallback_criteria.get(change_type, [
-        "Implementation meets business requirements and user needs",
-        "Changes integrate well with existing functionality and workflows", 
-        "User experience is maintained or improved",
-        "Solution follows established design patterns and best practices"
-    ])
+    job = None
+    if len(deferred) >= BATCH_MIN_RECORDS:
+        try:
+            job = _submit_batch_job([_batch_record(record_id, messages) for record_id, messages in deferred])
+        except Exception as err:
+            logger.error("Batch inference submission failed, running %d records synchronously: %s", len(deferred), err)
+    elif deferred:
+        logger.info("%d records is below the batch minimum of %d; running synchronously", len(deferred), BATCH_MIN_RECORDS)
+    if job is None:
+        for record_id, messages in deferred:
+            sync_results[record_id] = invoke_nova_lite(messages)
     
-    return base_criteria
+    return {"job": job, "synchronous": sync_results}
+
+def _submit_batch_job(records: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Upload the JSONL input and create the Bedrock batch inference job; raises on failure."""
+    s3, bedrock = _batch_clients()
+    job_name = f"ai-analysis-batch-{int(time.time())}"
+    input_key = f"batch-input/{job_name}.jsonl"
+    s3.put_object(
+        Bucket=BATCH_BUCKET,
+        Key=input_key,
+        Body="\n".join(json.dumps(record, ensure_ascii=False) for record in records).encode('utf-8'),
+        ContentType='application/jsonl'
+    )
+    output_uri = f"s3://{BATCH_BUCKET}/batch-output/{job_name}/"
+    response = bedrock.create_model_invocation_job(
+        jobName=job_name,
+        roleArn=BATCH_ROLE_ARN,
+        modelId=BEDROCK_MODEL,
+        inputDataConfig={"s3InputDataConfig": {"s3Uri": f"s3://{BATCH_BUCKET}/{input_key}"}},
+        outputDataConfig={"s3OutputDataConfig": {"s3Uri": output_uri}}
+    )
+    logger.info("Submitted batch inference job %s with %d records", job_name, len(records))
+    return {
+        "jobArn": response['jobArn'],
+        "jobName": job_name,
+        "outputUri": output_uri,
+        "recordCount": len(records)
+    }
+
+def _invocation_deadline(context: Any) -> Optional[float]:
+    """time.monotonic() deadline leaving _RESPONSE_TIME_RESERVE seconds to build the fallback."""
+    get_remaining = getattr(context, 'get_remaining_time_in_millis', None)
+    if get_remaining is None:
+        return None
+    return time.monotonic() + get_remaining() / 1000 - _RESPONSE_TIME_RESERVE
+
+def _describe_image(asset: Dict[str, Any]) -> str:
+    """One prompt line of uploaded image metadata."""
+    alt_text = asset.get('altText', '')
+    alt_status = f"Alt text provided: '{alt_text}'" if alt_text else "Alt text: NOT PROVIDED"
+    return (
+        f"{asset.get('type', 'unknown').title()} image: {asset.get('filename', 'unknown')} "
+        f"({asset.get('width', 0)}x{asset.get('height', 0)}px), {alt_status}"
+    )
 
 def extract_user_context(event):
     """Extract user context from JWT claims in the event"""
     try:
-        claims = event.get('requestContext', {}).get('authorizer', {}).get('jwt', {}).get('claims', {})
+        try:
+            claims = event['requestContext']['authorizer']['jwt']['claims']
+        except (KeyError, TypeError):
+            claims = None
         if not claims:
-            print('No JWT claims found in event requestContext')
+            logger.warning('No JWT claims found in event requestContext')
             return None
 
         email = claims.get('email')
@@ -730,16 +1371,16 @@ def extract_user_context(event):
         username = claims.get('cognito:username') or claims.get('username')
 
         if not email or not user_id:
-            print(f'Missing required JWT claims: email={bool(email)}, userId={bool(user_id)}')
+            logger.warning('Missing required JWT claims: email=%s, userId=%s', bool(email), bool(user_id))
             return None
 
         return {
             'email': email,
             'userId': user_id,
-            'username': username or email.split('@')[0]  # fallback to email prefix if no username
+            'username': username or email.partition('@')[0]  # fallback to email prefix if no username
         }
     except Exception as err:
-        print(f'Error extracting user context from JWT: {err}')
+        logger.error('Error extracting user context from JWT: %s', err)
         return None
 
 def lambda_handler(event, context):
@@ -747,66 +1388,37 @@ def lambda_handler(event, context):
     AI Preview Lambda - Real-time form analysis using Nova Lite
     Replaces mock AI preview with actual Bedrock Runtime API calls
     """
+    # Bound before the try so the error path can reuse whatever was already parsed
+    body = {}
+    ticket_summary = None
     try:
         # Extract user context from JWT claims - required for internal portal security
         user_context = extract_user_context(event)
         if not user_context:
-            print('No JWT user context found in event')
+            logger.warning('No JWT user context found in event')
             return {
                 'statusCode': 401,
-                'headers': {
-                    'Content-Type': 'application/json',
-                    'Access-Control-Allow-Origin': ALLOWED_ORIGIN,
-                    'Access-Control-Allow-Headers': 'Content-Type, Authorization',
-                    'Access-Control-Allow-Methods': 'POST, OPTIONS',
-                    'WWW-Authenticate': 'Bearer realm="API"'
-                },
-                'body': json.dumps({
+                'headers': _UNAUTHORIZED_HEADERS,
+                'body': _response_body({
                     'error': 'unauthorized',
                     'message': 'Valid JWT token required'
                 })
             }
 
-        print(f"AI Preview request from authenticated user: email={user_context['email']}, userId={user_context['userId']}")
+        logger.info("AI Preview request from authenticated user: email=%s, userId=%s", user_context['email'], user_context['userId'])
 
         # Parse request body
-        if 'body' in event:
-            body = json.loads(event['body']) if isinstance(event['body'], str) else event['body']
-        else:
-            body = event
+        body = _request_body(event)
         
         # Extract form data
         form_data = body.get('formData', {})
         
         # Create concise ticket summary for Nova Lite
-        ticket_summary = {
-            "requesterName": form_data.get('requesterName', ''),
-            "changeType": form_data.get('changeType', ''),
-            "pageArea": form_data.get('pageArea', ''),
-            "description": form_data.get('description', ''),
-            "pageUrls": form_data.get('pageUrls', []),
-            "language": form_data.get('language', ''),
-            "targetLaunchDate": form_data.get('targetLaunchDate', ''),
-            "department": form_data.get('department', ''),
-            "copyEn": form_data.get('copyEn', ''),
-            "copyZh": form_data.get('copyZh', '')
-        }
-        
-        # Policy bullets (based on actual /policies directory)
-        policies = [
-            "- Alt text is required for all marketing images (accessibility.md)",
-            "- Hero images: Desktop ≥1440px width, 600-800px height. Mobile ≥750px width, ~1000px height (performance.md)",
-            "- Image file size: Hero max 500KB, other images max 300KB (performance.md)", 
-            "- Brand colors: Primary #5754FF, avoid off-palette colors except for banner images (brand.md)",
-            "- Voice: Clear, concise, benefit-first. Avoid hype words like 'FREE!!!' (brand.md)",
-            "- No ALL-CAPS headlines, use Title Case or Sentence case (brand.md)",
-            "- Buttons: One primary CTA per view, min 44px touch height (design-system.md)",
-            "- Mid-Autumn Festival exception: Traditional illustration and non-brand colors allowed for seasonal campaigns (brand.md)"
-        ]
+        ticket_summary = TicketSummary.from_form_data(form_data)
         
         # Get change-type-specific prompt template
-        change_type = form_data.get('changeType', '')
-        business_prompt = get_business_focused_prompt(change_type, ticket_summary, policies)
+        change_type = ticket_summary.change_type
+        business_prompt = get_business_focused_prompt(change_type, ticket_summary)
         
         # Prepare Nova Lite prompt with business focus
         messages = [
@@ -821,67 +1433,47 @@ def lambda_handler(event, context):
         if uploaded_assets:
             # For MVP, we'll process image metadata only
             # In production, you'd fetch actual image bytes from S3
-            image_details = []
-            for asset in uploaded_assets[:2]:  # Limit to first 2 images
-                filename = asset.get('filename', 'unknown')
-                width = asset.get('width', 0)
-                height = asset.get('height', 0)
-                alt_text = asset.get('altText', '')
-                img_type = asset.get('type', 'unknown')
-                
-                alt_status = f"Alt text provided: '{alt_text}'" if alt_text else "Alt text: NOT PROVIDED"
-                image_details.append(f"{img_type.title()} image: {filename} ({width}x{height}px), {alt_status}")
-            
-            messages[0]["content"].append({
-                "text": f"Uploaded Images:\n" + "\n".join(image_details)
-            })
+            image_details = "\n".join([_describe_image(asset) for asset in uploaded_assets[:2]])  # Limit to first 2 images
+            messages[0]["content"].append({"text": "Uploaded Images:\n" + image_details})
         
-        # Call Nova Lite via Bedrock Runtime API
-        response = bedrock_runtime.converse(
-            modelId="amazon.nova-lite-v1:0",
-            messages=messages,
-            inferenceConfig={
-                "maxTokens": 500,  # Increased to avoid truncation
-                "temperature": 0.2,
-                "topP": 0.9
-            }
+        # Reuse a prior response for an equivalent request, otherwise call Nova Lite via Bedrock
+        prompt_hash, prompt_embedding, response_text = (
+            semantic_cache_lookup(change_type, messages) if SEMANTIC_CACHE_TABLE else ('', None, None)
         )
-        
-        # Extract response text
-        response_text = response['output']['message']['content'][0]['text']
+        if response_text is None:
+            response_text = invoke_nova_lite(messages, _invocation_deadline(context))
         
         # Parse JSON response (handle markdown code blocks)
         try:
             # Remove markdown code blocks if present
-            if response_text.startswith('```json'):
-                response_text = response_text.replace('```json\n', '').replace('\n```', '').strip()
-            elif response_text.startswith('```'):
-                response_text = response_text.replace('```\n', '').replace('\n```', '').strip()
+            response_text = _strip_code_fence(response_text)
             
             ai_analysis = json.loads(response_text)
+            
+            # Only well-formed responses are cached; malformed ones fall through to the fallback
+            if prompt_embedding is not None:
+                semantic_cache_store(change_type, prompt_hash, prompt_embedding, response_text)
         except json.JSONDecodeError as e:
-            print(f"JSON parsing error: {e}")
-            print(f"Response text: {response_text}")
+            logger.warning("JSON parsing error: %s", e)
+            logger.debug("Response text: %s", response_text)
             # Fallback with proper field validation when AI response is malformed
             ai_analysis = generate_field_validation_fallback(ticket_summary, change_type)
         
-        # Ensure required fields exist
-        ai_analysis.setdefault('decision', 'approve')
-        ai_analysis.setdefault('issues', [])
-        ai_analysis.setdefault('acceptanceCriteria', [])
-        ai_analysis.setdefault('confidence', 0.5)
+        # Ensure required fields exist (fields present in the analysis win)
+        ai_analysis = _AI_DEFAULTS | ai_analysis
         
         # HARDCODED: Always add New Feature reminder directly to Summary card (not as issue)
         if change_type == "New Feature":
             # Always add the reminder as a summary-level note (hardcoded, not AI-generated)
             # This will be displayed in the Summary card itself, not as a separate issue
-            ai_analysis['summaryNote'] = "Note: New Feature requests typically require additional technical documentation and internal review before implementation. Consider providing user workflows, wireframes, and integration details for smoother development."
+            ai_analysis['summaryNote'] = _NEW_FEATURE_NOTE
             
             # Check if there are any high-severity validation issues (missing required fields)
-            has_high_severity_issues = any(
-                issue.get('severity') == 'high' 
-                for issue in ai_analysis.get('issues', [])
-            )
+            has_high_severity_issues = False
+            for issue in ai_analysis['issues']:
+                if issue.get('severity') == 'high':
+                    has_high_severity_issues = True
+                    break
             
             # For complete forms (no high-severity issues), clear AI issues completely
             if not has_high_severity_issues:
@@ -896,47 +1488,35 @@ def lambda_handler(event, context):
         # Apply simplified quality validation and filtering
         if ai_analysis.get('acceptanceCriteria'):
             # First filter out system-enforced items
-            filtered_criteria = filter_system_enforced_items(
-                ai_analysis['acceptanceCriteria'], 
-                change_type
-            )
+            filtered_criteria = _filter_system_enforced(ai_analysis['acceptanceCriteria'])
             
-            # Apply quality validation with deduplication
-            quality_results = apply_quality_validation_and_fallback(filtered_criteria, change_type, ticket_summary)
+            # Apply quality validation with deduplication (reuses the lowercased criteria)
+            quality_results = _apply_quality_validation(filtered_criteria, change_type, ticket_summary)
             
             # Update acceptance criteria with quality-validated results
-            ai_analysis['acceptanceCriteria'] = quality_results['acceptance_criteria']
+            ai_analysis['acceptanceCriteria'] = quality_results.acceptance_criteria
             
             # Add minimal quality metadata (optional, for monitoring)
-            if quality_results['quality_validation'].get('used_fallback'):
-                ai_analysis['qualityNote'] = quality_results['quality_validation']['reason']
+            if quality_results.quality_validation.used_fallback:
+                ai_analysis['qualityNote'] = quality_results.quality_validation.reason
         
         # Return response for API Gateway
         return {
             'statusCode': 200,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': ALLOWED_ORIGIN,
-                'Access-Control-Allow-Headers': 'Content-Type',
-                'Access-Control-Allow-Methods': 'POST, OPTIONS'
-            },
-            'body': json.dumps(ai_analysis)
+            'headers': _JSON_CORS_HEADERS,
+            'body': _response_body(ai_analysis)
         }
         
     except Exception as e:
-        print(f"Error in AI Preview Lambda with user context: {str(e)}")
-        print(f"User context: {event.get('requestContext', {}).get('authorizer', {}).get('jwt', {}).get('claims', {}).get('email', 'unknown')}")
-        print(f"Timestamp: {context.aws_request_id if context else 'unknown'}")
+        logger.exception("Error in AI Preview Lambda with user context: %s", e)
+        logger.error("User context: %s", event.get('requestContext', {}).get('authorizer', {}).get('jwt', {}).get('claims', {}).get('email', 'unknown'))
+        logger.error("Timestamp: %s", context.aws_request_id if context else 'unknown')
         
         # Return error response with business-focused fallback
-        change_type = body.get('formData', {}).get('changeType', 'general')
-        form_data = body.get('formData', {})
-        ticket_summary = {
-            "pageArea": form_data.get('pageArea', ''),
-            "description": form_data.get('description', ''),
-            "copyEn": form_data.get('copyEn', ''),
-            "copyZh": form_data.get('copyZh', '')
-        }
+        if ticket_summary is None:
+            form_data = body.get('formData', {}) if isinstance(body, dict) else {}
+            ticket_summary = TicketSummary.from_form_data(form_data)
+        change_type = ticket_summary.change_type
         fallback_criteria = get_fallback_business_criteria(change_type, ticket_summary)
         
         # Standard error handling with friendly New Feature reminder
@@ -944,11 +1524,7 @@ def lambda_handler(event, context):
         
         # Add friendly reminder for New Feature requests
         if change_type == "New Feature":
-            error_issues.append({
-                "field": "internal_review", 
-                "severity": "low", 
-                "note": "Note: New Feature requests typically require additional technical documentation and internal review before implementation."
-            })
+            error_issues.append(_NEW_FEATURE_ERROR_REVIEW_ISSUE)
         
         error_response = {
             "decision": "approve",
@@ -960,20 +1536,10 @@ def lambda_handler(event, context):
         
         # HARDCODED: Always add New Feature reminder to Summary card (even in error cases)
         if change_type == "New Feature":
-            summary_reminder = {
-                "field": "summary_note",
-                "severity": "info",
-                "note": "Note: New Feature requests typically require additional technical documentation and internal review before implementation. Consider providing user workflows, wireframes, and integration details for smoother development."
-            }
-            error_response['issues'].append(summary_reminder)
+            error_response['issues'].append(_NEW_FEATURE_SUMMARY_ISSUE)
         
         return {
             'statusCode': 200,  # Return 200 to avoid frontend errors
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': ALLOWED_ORIGIN,
-                'Access-Control-Allow-Headers': 'Content-Type',
-                'Access-Control-Allow-Methods': 'POST, OPTIONS'
-            },
-            'body': json.dumps(error_response)
+            'headers': _JSON_CORS_HEADERS,
+            'body': _response_body(error_response)
         }
\ No newline at end of file
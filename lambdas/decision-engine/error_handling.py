@@ -10,10 +10,12 @@ from __future__ import annotations
 
 import logging
 import os
+import re
+from dataclasses import dataclass, field, fields
 from enum import Enum
-from typing import Any, Dict, List, Optional
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
 from datetime import datetime, timezone
-from urllib.parse import urlparse
 
 # Optional light import: only used for email templates when available
 try:
@@ -21,21 +23,131 @@ try:
 except Exception:  # pragma: no cover - templates are optional
     PromptTemplates = None  # type: ignore
 
+# Optional RE2 (google-re2 layer) for guaranteed linear-time matching of user-supplied text
+try:
+    import re2 as _claim_re_engine
+except ImportError:  # pragma: no cover - falls back to the stdlib engine
+    _claim_re_engine = re  # type: ignore
+
 logger = logging.getLogger(__name__)
 logger.setLevel(os.getenv("LOG_LEVEL", "INFO"))
 
 # Approved domains per policy; can be overridden via env APPROVED_DOMAINS (comma-separated)
-_DEFAULT_APPROVED_DOMAINS = [
+_DEFAULT_APPROVED_DOMAINS: FrozenSet[str] = frozenset((
     "logicart.com",
     "shop.logicart.com",
     "blog.logicart.com",
     "support.logicart.com",
-]
-APPROVED_DOMAINS: List[str] = [
-    d.strip().lower()
-    for d in os.getenv("APPROVED_DOMAINS", ",".join(_DEFAULT_APPROVED_DOMAINS)).split(",")
-    if d.strip()
-]
+))
+_APPROVED_DOMAINS_ENV = os.getenv("APPROVED_DOMAINS")
+# Only parse when the env var is set; the default needs no split/strip/lower pass
+APPROVED_DOMAINS: FrozenSet[str] = (
+    _DEFAULT_APPROVED_DOMAINS
+    if _APPROVED_DOMAINS_ENV is None
+    else frozenset(d.strip().lower() for d in _APPROVED_DOMAINS_ENV.split(",") if d.strip())
+)
+
+# Reversed-label trie over APPROVED_DOMAINS ("shop.logicart.com" -> com -> logicart -> shop).
+# A "*" label matches any single label, so "*.logicart.com" entries can approve subdomains;
+# the default list has no wildcards and therefore stays exact-match only.
+_TRIE_END = None
+
+
+def _build_domain_trie(domains: FrozenSet[str]) -> Dict[Any, Any]:
+    root: Dict[Any, Any] = {}
+    for domain in domains:
+        node = root
+        for label in reversed(domain.split(".")):
+            node = node.setdefault(label, {})
+        node[_TRIE_END] = True
+    return root
+
+
+_APPROVED_TRIE = _build_domain_trie(APPROVED_DOMAINS)
+
+
+def _is_approved_host(host: str) -> bool:
+    """Walk the host's labels right to left through the trie; O(labels) regardless of list size."""
+    nodes = [_APPROVED_TRIE]
+    for label in reversed(host.split(".")):
+        nodes = [c for n in nodes for c in (n.get(label), n.get("*")) if c is not None]
+        if not nodes:
+            return False
+    return any(_TRIE_END in n for n in nodes)
+
+# Text heuristics for misleading claims, by flag category
+_SUSPICIOUS_CLAIMS: Tuple[str, ...] = (
+    "100% off",
+    "free for life",
+    "guaranteed lowest price",
+    "unlimited for free",
+    "no terms apply",
+)
+_WATERMARK_TERMS: Tuple[str, ...] = ("watermark", "stock photo")
+# A set, so token-based brand checks can use O(1) membership
+_COMPETITOR_BRANDS: FrozenSet[str] = frozenset(("shopify", "woocommerce", "magento", "bigcommerce"))
+# Ticket fields scanned by the claim heuristics, in concatenation order
+_CLAIM_TEXT_FIELDS = ("title", "description", "copy_en", "copy_zh", "notes")
+# Line breaks, tabs and non-breaking spaces become plain spaces so multi-word terms still match
+_WHITESPACE_TABLE = str.maketrans({"\t": " ", "\n": " ", "\r": " ", "\u00a0": " "})
+
+# Flags in reporting order; the category names are the group names in _CLAIM_RE
+_CLAIM_FLAGS = (
+    ("misleading", "Possible misleading claim detected in description/copy (requires manual verification)"),
+    ("watermark", "Possible watermark/stock photo concern (requires manual verification)"),
+    # Competitor brand hints (textual only; visual cannot be verified)
+    ("competitor", "Possible competitor branding mentioned in description (visual verification required)"),
+)
+
+
+def _claim_group(name: str, terms: Iterable[str]) -> str:
+    # Sorted so the compiled pattern does not depend on set iteration order
+    return f"(?P<{name}>{'|'.join(_claim_re_engine.escape(t) for t in sorted(terms))})"
+
+
+# Single multi-pattern matcher for all categories. RE2 has no lookaround, so this is a plain
+# alternation with non-overlapping matches; no term of one category overlaps a term of another,
+# so it still finds the same categories as separate `in` checks (only presence is reported).
+_CLAIM_RE = _claim_re_engine.compile(
+    "|".join((
+        _claim_group("misleading", _SUSPICIOUS_CLAIMS),
+        _claim_group("watermark", _WATERMARK_TERMS),
+        _claim_group("competitor", _COMPETITOR_BRANDS),
+    ))
+)
+
+
+def _netloc(u: str) -> str:
+    """
+    Lowercased host of an absolute or scheme-relative URL, without userinfo or port ('' if none).
+    A minimal stand-in for urlparse(u).hostname on the domain-check hot path.
+    """
+    start = u.find("://")
+    if start >= 0:
+        start += 3
+    elif u.startswith("//"):
+        start = 2
+    else:
+        return ""
+    end = min((i for i in (u.find(c, start) for c in "/?#") if i >= 0), default=len(u))
+    return u[start:end].rpartition("@")[2].partition(":")[0].lower()
+
+
+_NAME_SEPARATORS = re.compile(r"[._]")
+
+
+@lru_cache(maxsize=1024)
+def _name_from_email(email: str) -> str:
+    """Greeting name from an email's local part ("jane.doe@..." -> "Jane Doe"); "User" if none."""
+    if not email or "@" not in email:
+        return "User"
+    local = email.partition("@")[0]
+    return " ".join(p.title() for p in _NAME_SEPARATORS.split(local) if p) or "User"
+
+
+def _utc_now_z() -> str:
+    """UTC timestamp as ISO 8601 with a 'Z' suffix (the fixed '+00:00' tail is sliced off)."""
+    return datetime.now(timezone.utc).isoformat(timespec="microseconds")[:-6] + "Z"
 
 
 class ErrorType(Enum):
@@ -51,6 +163,103 @@ class ErrorType(Enum):
     UNKNOWN_ERROR = "unknown_error"
 
 
+# Error types that route to the vision-free fallbacks rather than manual review
+_BEDROCK_ERROR_TYPES: FrozenSet[ErrorType] = frozenset(
+    (ErrorType.BEDROCK_UNAVAILABLE, ErrorType.BEDROCK_TIMEOUT, ErrorType.BEDROCK_QUOTA_EXCEEDED)
+)
+
+
+@dataclass(slots=True)
+class DecisionResult:
+    """Fallback decision; optional fields left as None do not apply to the path that produced it."""
+    decision: str
+    reasons: List[str]
+    confidence: float
+    email: Optional[Dict[str, str]]
+    analysis_timestamp: str = field(default_factory=_utc_now_z)
+    summary: Optional[str] = None
+    analysis_method: Optional[str] = None
+    fallback_analysis: Optional[bool] = None
+    visual_analysis_unavailable: Optional[bool] = None
+    error: Optional[bool] = None
+    manual_review_required: Optional[bool] = None
+    sns_error: Optional[bool] = None
+    manual_notification_required: Optional[bool] = None
+    fallback_reason: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain dict for the public API; called once, where a result leaves this module."""
+        # decision/reasons/confidence/email/analysis_timestamp are always present (email may be None)
+        out: Dict[str, Any] = {}
+        for name in _DECISION_FIELDS:
+            value = getattr(self, name)
+            if value is not None or name == "email":
+                out[name] = value
+        return out
+
+
+_DECISION_FIELDS: Tuple[str, ...] = tuple(f.name for f in fields(DecisionResult))
+
+
+def _build_banner_email_with_templates(
+    *,
+    decision: str,
+    title: str,
+    ticket_id: str,
+    requester_name: str,
+    requester_email: str,
+    reasons: List[str],
+) -> Dict[str, str]:
+    key = "banner_needs_info" if decision == "NEEDS_INFO" else "banner_reject"
+    tpl = PromptTemplates.format_email_template(
+        key,
+        requester_name=requester_name,
+        requester_email=requester_email,
+        title=title,
+        ticket_id=ticket_id,
+        reasons=reasons,
+    )
+    return {"subject": tpl.get("subject", ""), "body": tpl.get("body", "")}
+
+
+def _build_banner_email_inline(
+    *,
+    decision: str,
+    title: str,
+    ticket_id: str,
+    requester_name: str,
+    requester_email: str,
+    reasons: List[str],
+) -> Dict[str, str]:
+    # Minimal inline templates if PromptTemplates is not available
+    reasons_list = "\n".join(f"• {r}" for r in reasons) if reasons else "• Details pending"
+    if decision == "REJECT":
+        subject = f"Banner Request Rejected - {title}"
+        body = (
+            f"Dear {requester_name},\n\n"
+            f"Your banner request '{title}' (ID: {ticket_id}) has been rejected:\n\n"
+            f"{reasons_list}\n\n"
+            "Please correct the issues and resubmit.\n\n"
+            "Best regards,\nLogicCart Review Team"
+        )
+    else:
+        subject = "Banner Request - Additional Information Required"
+        body = (
+            f"Dear {requester_name},\n\n"
+            f"Your banner request '{title}' (ID: {ticket_id}) requires clarification:\n\n"
+            f"{reasons_list}\n\n"
+            "Visual analysis is currently unavailable, so we cannot verify visual quality/brand alignment automatically.\n"
+            "Please provide clarifications or updated assets for manual review.\n\n"
+            "Best regards,\nLogicCart Review Team"
+        )
+    return {"subject": subject, "body": body}
+
+
+# PromptTemplates availability is fixed at import, so the email builder is chosen once
+# (templates when available for consistency, minimal inline wording otherwise)
+_BUILD_BANNER_EMAIL = _build_banner_email_with_templates if PromptTemplates else _build_banner_email_inline
+
+
 class FallbackDecisionEngine:
     """
     Rule-based fallback analysis when Nova Lite is unavailable.
@@ -60,13 +269,23 @@ class FallbackDecisionEngine:
        Otherwise prefer NEEDS_INFO with 'visual analysis unavailable' guidance.
     """
 
+    analysis_timestamp = staticmethod(_utc_now_z)
+    _build_banner_email = staticmethod(_BUILD_BANNER_EMAIL)
+
     def __init__(self) -> None:
-        self.analysis_timestamp = lambda: datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
         logger.info("FallbackDecisionEngine initialized")
 
     # --------- Public API --------- #
 
     def analyze_banner_fallback(self, ticket_data: Dict[str, Any], policy_text: str) -> Dict[str, Any]:
+        """Dict form of banner_fallback_decision()."""
+        return self.banner_fallback_decision(ticket_data, policy_text).to_dict()
+
+    def generate_feature_needs_info(self, ticket_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Dict form of feature_needs_info_decision()."""
+        return self.feature_needs_info_decision(ticket_data).to_dict()
+
+    def banner_fallback_decision(self, ticket_data: Dict[str, Any], policy_text: str) -> DecisionResult:
         """
         Perform policy-aligned, conservative fallback for NEW_BANNER without vision.
         Checks performed:
@@ -75,11 +294,6 @@ class FallbackDecisionEngine:
         We do NOT check: file size/format/dimensions/alt-text/required fields (frontend already validates).
         We do NOT try to guess visual quality or brand alignment without the model.
         """
-        ticket_id = ticket_data.get("id", "unknown")
-        title = ticket_data.get("title") or ticket_data.get("description") or "Banner Request"
-        requester_email = ticket_data.get("requester_email", "")
-        requester_name = ticket_data.get("requester_name") or self._name_from_email(requester_email)
-
         reasons: List[str] = []
         decision = "NEEDS_INFO"
         confidence = 0.55  # modest confidence; we lack vision
@@ -89,16 +303,19 @@ class FallbackDecisionEngine:
         url_issues = self._check_urls(ticket_data)
         if url_issues:
             reasons.extend(url_issues)
+        domain_violation = any("non-approved domain" in r for r in url_issues)
 
-        # 2) Best-effort text heuristics for misleading claims (conservative: flags lead to NEEDS_INFO)
-        claim_flags = self._check_misleading_claims(ticket_data)
-        if claim_flags:
-            reasons.extend(claim_flags)
+        # 2) Best-effort text heuristics for misleading claims (conservative: flags lead to NEEDS_INFO).
+        #    Skipped once a domain violation has already decided REJECT.
+        if not domain_violation:
+            claim_flags = self._check_misleading_claims(ticket_data)
+            if claim_flags:
+                reasons.extend(claim_flags)
 
         # Decision rules (conservative):
         # - If any non-approved domain issue is present => REJECT (clear violation)
         # - Else NEEDS_INFO (we cannot verify visual quality/brand/appropriateness without the model)
-        if any("non-approved domain" in r.lower() for r in reasons):
+        if domain_violation:
             decision = "REJECT"
             confidence = 0.9  # clear, objective violation
         else:
@@ -108,51 +325,40 @@ class FallbackDecisionEngine:
             decision = "NEEDS_INFO"
             confidence = max(confidence, 0.6)
 
-        # Build email
+        # Build email only once the decision is final
+        requester_email = ticket_data.get("requester_email", "")
         email = self._build_banner_email(
             decision=decision,
-            title=title,
-            ticket_id=ticket_id,
-            requester_name=requester_name,
+            title=ticket_data.get("title") or ticket_data.get("description") or "Banner Request",
+            ticket_id=ticket_data.get("id", "unknown"),
+            requester_name=ticket_data.get("requester_name") or _name_from_email(requester_email),
             requester_email=requester_email,
             reasons=reasons,
         )
 
-        result: Dict[str, Any] = {
-            "decision": decision,
-            "reasons": reasons[:5],
-            "confidence": confidence,
-            "summary": summary,
-            "email": email,
-            "fallback_analysis": True,
-            "visual_analysis_unavailable": True,
-            "analysis_method": "rule_based_fallback",
-            "analysis_timestamp": self.analysis_timestamp(),
-        }
-        return result
+        return DecisionResult(
+            decision=decision,
+            reasons=reasons[:5],
+            confidence=confidence,
+            email=email,
+            summary=summary,
+            fallback_analysis=True,
+            visual_analysis_unavailable=True,
+            analysis_method="rule_based_fallback",
+        )
 
-    def generate_feature_needs_info(self, ticket_data: Dict[str, Any]) -> Dict[str, Any]:
+    def feature_needs_info_decision(self, ticket_data: Dict[str, Any]) -> DecisionResult:
         """
         Feature requests ALWAYS return NEEDS_INFO per policy, with guidance email.
         """
         ticket_id = ticket_data.get("id", "unknown")
         title = ticket_data.get("title") or ticket_data.get("description") or "Request"
         requester_email = ticket_data.get("requester_email", "")
-        requester_name = ticket_data.get("requester_name") or self._name_from_email(requester_email)
+        requester_name = ticket_data.get("requester_name") or _name_from_email(requester_email)
 
         reasons = ["Requires user stories, visual mockups (Figma), technical specs, and success metrics"]
-        subject = f"Feature Request - Specification Required"
-        body = (
-            f"Dear {requester_name},\n\n"
-            f"Thank you for your feature request '{title}' (ID: {ticket_id}). To proceed, please provide:\n\n"
-            "1) User stories: \"As a [role], I want [feature], so that [benefit]\"\n"
-            "2) Visual mockups: reference images, wireframes, or Figma links\n"
-            "3) Technical specs: APIs, data model/DB changes, integrations, constraints\n"
-            "4) Success metrics: KPIs, engagement targets, business impact\n\n"
-            "Reply with these details to continue processing.\n\n"
-            "Best regards,\nLogicCart Development Team"
-        )
 
+        tpl: Dict[str, str] = {}
         if PromptTemplates:
             tpl = PromptTemplates.format_email_template(
                 "feature_needs_info",
@@ -160,25 +366,38 @@ class FallbackDecisionEngine:
                 title=title,
                 ticket_id=ticket_id,
             )
-            subject = tpl.get("subject", subject)
-            body = tpl.get("body", body)
-
-        return {
-            "decision": "NEEDS_INFO",
-            "reasons": reasons,
-            "confidence": 1.0,
-            "email": {"subject": subject, "body": body},
-            "fallback_analysis": False,  # This is standard behavior, not a fallback
-            "analysis_method": "policy_feature_guidance",
-            "analysis_timestamp": self.analysis_timestamp(),
-        }
+        # Inline wording is only formatted when the template did not supply it
+        subject = tpl["subject"] if "subject" in tpl else "Feature Request - Specification Required"
+        if "body" in tpl:
+            body = tpl["body"]
+        else:
+            body = (
+                f"Dear {requester_name},\n\n"
+                f"Thank you for your feature request '{title}' (ID: {ticket_id}). To proceed, please provide:\n\n"
+                "1) User stories: \"As a [role], I want [feature], so that [benefit]\"\n"
+                "2) Visual mockups: reference images, wireframes, or Figma links\n"
+                "3) Technical specs: APIs, data model/DB changes, integrations, constraints\n"
+                "4) Success metrics: KPIs, engagement targets, business impact\n\n"
+                "Reply with these details to continue processing.\n\n"
+                "Best regards,\nLogicCart Development Team"
+            )
+
+        return DecisionResult(
+            decision="NEEDS_INFO",
+            reasons=reasons,
+            confidence=1.0,
+            email={"subject": subject, "body": body},
+            fallback_analysis=False,  # This is standard behavior, not a fallback
+            analysis_method="policy_feature_guidance",
+        )
 
     # --------- Internals --------- #
 
-    def _check_urls(self, ticket_data: Dict[str, Any]) -> List[str]:
+    def _check_urls(self, ticket_data: Dict[str, Any], stop_on_first: bool = False) -> List[str]:
         """
         Validate URLs against approved domains.
         If any URL is outside APPROVED_DOMAINS => REJECT-able violation per policy.
+        With stop_on_first, return as soon as one non-approved URL is found (REJECT signal only).
         """
         issues: List[str] = []
         urls: List[str] = []
@@ -191,15 +410,21 @@ class FallbackDecisionEngine:
         if isinstance(page_urls, list):
             urls.extend([u for u in page_urls if isinstance(u, str) and u.strip()])
 
+        # Each distinct URL is checked once, and each bad host is reported once (first URL wins)
+        seen_urls: Set[str] = set()
+        bad_hosts: Set[str] = set()
         for u in urls:
-            try:
-                netloc = urlparse(u).netloc.lower()
-                # Allow exact matches; also allow any subdomain under logicart.com as approved,
-                # but policy lists explicit approved subdomains — we'll enforce exact matches conservatively.
-                if netloc not in APPROVED_DOMAINS:
-                    issues.append(f"Target URL '{u}' uses non-approved domain (policy: approved LogicCart properties only)")
-            except Exception:
-                issues.append(f"Target URL '{u}' is invalid or cannot be parsed")
+            key = u.lower()
+            if key in seen_urls:
+                continue
+            seen_urls.add(key)
+            host = _netloc(u)
+            # Policy lists explicit approved subdomains — exact matches unless a "*." entry is configured.
+            if host not in bad_hosts and not _is_approved_host(host):
+                bad_hosts.add(host)
+                issues.append(f"Target URL '{u}' uses non-approved domain (policy: approved LogicCart properties only)")
+                if stop_on_first:
+                    break
 
         return issues
 
@@ -209,95 +434,26 @@ class FallbackDecisionEngine:
         We do not attempt to overreach; these flags lead to NEEDS_INFO, not automatic reject.
         """
         flags: List[str] = []
-        text_blobs: List[str] = []
-
-        for key in ("title", "description", "copy_en", "copy_zh", "notes"):
-            v = ticket_data.get(key)
-            if isinstance(v, str) and v.strip():
-                text_blobs.append(v.strip().lower())
-
-        if not text_blobs:
+        text = " ".join(
+            blob
+            for key in _CLAIM_TEXT_FIELDS
+            if isinstance(v := ticket_data.get(key), str) and (blob := v.strip())
+        ).lower().translate(_WHITESPACE_TABLE)
+        if not text:
             return flags
 
-        text = " ".join(text_blobs)
-
-        suspicious = [
-            "100% off",
-            "free for life",
-            "guaranteed lowest price",
-            "unlimited for free",
-            "no terms apply",
-        ]
-        if any(s in text for s in suspicious):
-            flags.append("Possible misleading claim detected in description/copy (requires manual verification)")
-
-        # Watermark hints
-        if "watermark" in text or "stock photo" in text:
-            flags.append("Possible watermark/stock photo concern (requires manual verification)")
-
-        # Competitor brand hints (textual only; visual cannot be verified)
-        competitors = ["shopify", "woocommerce", "magento", "bigcommerce"]
-        if any(c in text for c in competitors):
-            flags.append("Possible competitor branding mentioned in description (visual verification required)")
+        # One scan over the text collects every flag category present; stop once all have been seen
+        found: Set[str] = set()
+        for m in _CLAIM_RE.finditer(text):
+            found.add(m.lastgroup)
+            if len(found) == len(_CLAIM_FLAGS):
+                break
+        for category, flag in _CLAIM_FLAGS:
+            if category in found:
+                flags.append(flag)
 
         return flags
 
-    def _name_from_email(self, email: str) -> str:
-        if not email or "@" not in email:
-            return "User"
-        local = email.split("@")[0]
-        if "." in local:
-            return " ".join(p.title() for p in local.split("."))
-        if "_" in local:
-            return " ".join(p.title() for p in local.split("_"))
-        return local.title()
-
-    def _build_banner_email(
-        self,
-        *,
-        decision: str,
-        title: str,
-        ticket_id: str,
-        requester_name: str,
-        requester_email: str,
-        reasons: List[str],
-    ) -> Dict[str, str]:
-        # Try to use PromptTemplates when available for consistency
-        if PromptTemplates:
-            key = "banner_needs_info" if decision == "NEEDS_INFO" else "banner_reject"
-            tpl = PromptTemplates.format_email_template(
-                key,
-                requester_name=requester_name,
-                requester_email=requester_email,
-                title=title,
-                ticket_id=ticket_id,
-                reasons=reasons,
-            )
-            return {"subject": tpl.get("subject", ""), "body": tpl.get("body", "")}
-
-        # Minimal inline templates if PromptTemplates is not available
-        reasons_list = "\n".join(f"• {r}" for r in reasons) if reasons else "• Details pending"
-        if decision == "REJECT":
-            subject = f"Banner Request Rejected - {title}"
-            body = (
-                f"Dear {requester_name},\n\n"
-                f"Your banner request '{title}' (ID: {ticket_id}) has been rejected:\n\n"
-                f"{reasons_list}\n\n"
-                "Please correct the issues and resubmit.\n\n"
-                "Best regards,\nLogicCart Review Team"
-            )
-        else:
-            subject = "Banner Request - Additional Information Required"
-            body = (
-                f"Dear {requester_name},\n\n"
-                f"Your banner request '{title}' (ID: {ticket_id}) requires clarification:\n\n"
-                f"{reasons_list}\n\n"
-                "Visual analysis is currently unavailable, so we cannot verify visual quality/brand alignment automatically.\n"
-                "Please provide clarifications or updated assets for manual review.\n\n"
-                "Best regards,\nLogicCart Review Team"
-            )
-        return {"subject": subject, "body": body}
-
 
 class ErrorHandler:
     """
@@ -320,6 +476,20 @@ class ErrorHandler:
             ErrorType.VALIDATION_ERROR: ["validation", "invalid", "schema", "format"],
         }
 
+        # Inverted index: keyword -> (priority, type), priority being the _patterns order
+        self._keyword_index: Dict[str, Tuple[int, ErrorType]] = {}
+        for rank, (etype, pats) in enumerate(self._patterns.items()):
+            for p in pats:
+                self._keyword_index.setdefault(p, (rank, etype))
+
+        # Keywords bucketed by first character (each bucket in priority order), so a message
+        # is only tested against keywords whose first character it actually contains
+        self._by_first_char: Dict[str, List[Tuple[str, int, ErrorType]]] = {}
+        for p, (rank, etype) in self._keyword_index.items():
+            self._by_first_char.setdefault(p[0], []).append((p, rank, etype))
+        for bucket in self._by_first_char.values():
+            bucket.sort(key=lambda entry: entry[1])
+
     # --------- Public API --------- #
 
     def classify_error(self, error_message: str, exception: Optional[Exception] = None) -> ErrorType:
@@ -335,12 +505,17 @@ class ErrorHandler:
             if "bedrock" in name or "bedrock" in em:
                 return ErrorType.BEDROCK_UNAVAILABLE
 
-        # Pattern search
-        for etype, pats in self._patterns.items():
-            if any(p in em for p in pats):
-                return etype
+        # Pattern search: lowest-priority-number match wins; buckets can stop at their first hit
+        best: Optional[Tuple[int, ErrorType]] = None
+        for ch in set(em):
+            for p, rank, etype in self._by_first_char.get(ch, ()):
+                if best is not None and rank >= best[0]:
+                    break
+                if p in em:
+                    best = (rank, etype)
+                    break
 
-        return ErrorType.UNKNOWN_ERROR
+        return best[1] if best else ErrorType.UNKNOWN_ERROR
 
     def handle_error(
         self,
@@ -349,22 +524,28 @@ class ErrorHandler:
         ticket_data: Dict[str, Any],
         policy_text: str = "",
     ) -> Dict[str, Any]:
-        logger.warning(f"Handling error type: {error_type.value} ({error_message})")
+        return self.resolve_error(error_type, error_message, ticket_data, policy_text).to_dict()
+
+    def resolve_error(
+        self,
+        error_type: ErrorType,
+        error_message: str,
+        ticket_data: Dict[str, Any],
+        policy_text: str = "",
+    ) -> DecisionResult:
+        """Typed form of handle_error(); the result is converted to a dict only by handle_error."""
+        logger.warning("Handling error type: %s (%s)", error_type.value, error_message)
 
         request_type = (ticket_data.get("request_type") or "").upper()
 
-        if error_type in (
-            ErrorType.BEDROCK_UNAVAILABLE,
-            ErrorType.BEDROCK_TIMEOUT,
-            ErrorType.BEDROCK_QUOTA_EXCEEDED,
-        ):
+        if error_type in _BEDROCK_ERROR_TYPES:
             if request_type == "NEW_BANNER":
-                result = self.fallback_engine.analyze_banner_fallback(ticket_data, policy_text)
-                result["fallback_reason"] = f"Vision temporarily unavailable: {error_message}"
+                result = self.fallback_engine.banner_fallback_decision(ticket_data, policy_text)
+                result.fallback_reason = f"Vision temporarily unavailable: {error_message}"
                 return result
             if request_type == "NEW_FEATURE":
-                result = self.fallback_engine.generate_feature_needs_info(ticket_data)
-                result["fallback_reason"] = f"Vision not required for features; guidance generated. ({error_message})"
+                result = self.fallback_engine.feature_needs_info_decision(ticket_data)
+                result.fallback_reason = f"Vision not required for features; guidance generated. ({error_message})"
                 return result
             return self._manual_review(ticket_data, f"Unknown request type during Bedrock issue: {request_type}")
 
@@ -376,26 +557,25 @@ class ErrorHandler:
 
         if error_type == ErrorType.SNS_ERROR:
             # Decision may still be valid; notify manual follow-up for email.
-            return {
-                "decision": "NEEDS_INFO",
-                "reasons": ["Decision completed but notification failed"],
-                "confidence": 0.5,
-                "summary": f"SNS publish error: {error_message}",
-                "email": None,
-                "sns_error": True,
-                "manual_notification_required": True,
-                "analysis_timestamp": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
-            }
+            return DecisionResult(
+                decision="NEEDS_INFO",
+                reasons=["Decision completed but notification failed"],
+                confidence=0.5,
+                email=None,
+                summary=f"SNS publish error: {error_message}",
+                sns_error=True,
+                manual_notification_required=True,
+            )
 
         # Network/validation/unknown — conservative manual review
         return self._manual_review(ticket_data, error_message or error_type.value)
 
     # --------- Internals --------- #
 
-    def _manual_review(self, ticket_data: Dict[str, Any], err: str) -> Dict[str, Any]:
+    def _manual_review(self, ticket_data: Dict[str, Any], err: str) -> DecisionResult:
         ticket_id = ticket_data.get("id", "unknown")
         requester_email = ticket_data.get("requester_email", "")
-        requester_name = ticket_data.get("requester_name") or self.fallback_engine._name_from_email(requester_email)
+        requester_name = ticket_data.get("requester_name") or _name_from_email(requester_email)
         title = ticket_data.get("title") or ticket_data.get("description") or "Request"
 
         subject = "Request Requires Manual Review - LogicCart"
@@ -409,16 +589,15 @@ class ErrorHandler:
             "Best regards,\nLogicCart Team"
         )
 
-        return {
-            "decision": "NEEDS_INFO",
-            "reasons": ["System error: manual review required"],
-            "confidence": 0.0,
-            "summary": f"Manual review due to error: {err}",
-            "email": {"subject": subject, "body": body},
-            "error": True,
-            "manual_review_required": True,
-            "analysis_timestamp": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
-        }
+        return DecisionResult(
+            decision="NEEDS_INFO",
+            reasons=["System error: manual review required"],
+            confidence=0.0,
+            email={"subject": subject, "body": body},
+            summary=f"Manual review due to error: {err}",
+            error=True,
+            manual_review_required=True,
+        )
 
 
 # Factory helpers
@@ -430,10 +609,22 @@ def create_error_handler() -> ErrorHandler:
     return ErrorHandler()
 
 
+# Both classes are stateless, so the convenience path shares one instance per container
+_DEFAULT_HANDLER: Optional[ErrorHandler] = None
+
+
+def _get_handler() -> ErrorHandler:
+    global _DEFAULT_HANDLER
+    if _DEFAULT_HANDLER is None:
+        _DEFAULT_HANDLER = create_error_handler()
+    return _DEFAULT_HANDLER
+
+
 # Convenience wrapper used by callers
 def handle_processing_error(
     error: Exception, ticket_data: Dict[str, Any], policy_text: str = ""
 ) -> Dict[str, Any]:
-    handler = create_error_handler()
+    handler = _get_handler()
     etype = handler.classify_error(str(error), error)
     return handler.handle_error(etype, str(error), ticket_data, policy_text)
+
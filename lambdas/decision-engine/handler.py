@@ -8,12 +8,24 @@ Policy-aligned:
 import json
 import os
 import logging
-from datetime import datetime
-from typing import Dict, Any, List, Optional
+import re
+from datetime import datetime, timezone
+from itertools import islice
+from typing import Dict, Any, List, Optional, Tuple
 from urllib.parse import urlparse
 
-from tools import get_ticket, get_policy, write_result, get_banner_image_url
-from nova_lite_analyzer import create_nova_lite_analyzer
+from tools import (
+    get_banner_image_url,
+    get_policy_cached,
+    get_ticket,
+    write_result,
+    write_results_bulk,
+)
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
 
 # Logging
 logger = logging.getLogger()
@@ -38,6 +50,47 @@ REDIRECT_HOST_HINTS = [
     ).split(",")
 ]
 
+# Precompiled matchers for _validate_urls: O(1) exact host lookup, one C-level endswith over all
+# approved suffixes (subdomains), and a single-pass regex for the redirect hint substrings.
+_APPROVED_SET = frozenset(APPROVED_DOMAINS)
+_APPROVED_SUFFIXES = tuple(f".{d}" for d in APPROVED_DOMAINS)
+_REDIRECT_HINT_RE = re.compile("|".join(map(re.escape, REDIRECT_HOST_HINTS)))
+# "<scheme>://<approved host>/" prefixes: the host is an exact approved match (never a redirect
+# hint), so such URLs need no parsing at all
+_FAST_APPROVED_PREFIXES = tuple(
+    f"{scheme}://{d}/" for scheme in ("https", "http") for d in APPROVED_DOMAINS
+)
+
+# LogicCart purple and complementary hues; fragments also catch near variants (e.g. "#A85599")
+_BRAND_COLORS = frozenset({"#5754FF", "#5E60F1", "#6366F1", "#8B5CF6", "#A855F7", "#C084FC"})
+_BRAND_HEX_FRAGMENTS = ("5754", "5E60", "6366", "8B5C", "A855", "C084")
+
+# Nova Lite analyzer (and its Bedrock client) is imported and created on the first NEW_BANNER
+# request, then reused by warm invocations; NEW_FEATURE-only containers never load it.
+_NOVA_ANALYZER = None
+
+
+def _get_nova_analyzer():
+    global _NOVA_ANALYZER
+    if _NOVA_ANALYZER is None:
+        from nova_lite_analyzer import create_nova_lite_analyzer
+        _NOVA_ANALYZER = create_nova_lite_analyzer()
+    return _NOVA_ANALYZER
+
+
+# Compact stdlib encoder, built once (default=str covers Decimals/datetimes from DynamoDB)
+_JSON_ENCODE = json.JSONEncoder(separators=(",", ":"), default=str).encode
+
+
+def _response_body(body: Dict[str, Any]) -> str:
+    """Serialize a response body; orjson when available, stdlib for payloads orjson rejects."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(body, default=str).decode()
+        except TypeError:
+            pass
+    return _JSON_ENCODE(body)
+
 
 def _resp(status: int, body: Dict[str, Any]) -> Dict[str, Any]:
     return {
@@ -48,14 +101,20 @@ def _resp(status: int, body: Dict[str, Any]) -> Dict[str, Any]:
             "Access-Control-Allow-Methods": "POST, OPTIONS",
             "Access-Control-Allow-Headers": "Content-Type",
         },
-        "body": json.dumps(body, default=str),
+        "body": _response_body(body),
     }
 
 
-def extract_user_context(event):
-    """Extract user context from JWT claims in the event"""
+def _jwt_claims(event) -> Dict[str, Any]:
+    """requestContext.authorizer.jwt.claims, or {} when any level is missing"""
+    return (((event.get('requestContext') or {}).get('authorizer') or {}).get('jwt') or {}).get('claims') or {}
+
+
+def extract_user_context(event, claims: Optional[Dict[str, Any]] = None):
+    """Extract user context from JWT claims in the event (or from claims already pulled out of it)"""
     try:
-        claims = event.get('requestContext', {}).get('authorizer', {}).get('jwt', {}).get('claims', {})
+        if claims is None:
+            claims = _jwt_claims(event)
         if not claims:
             logger.warning('No JWT claims found in event requestContext')
             return None
@@ -81,10 +140,15 @@ def lambda_handler(event, _context):
     """
     Expected route: POST /tickets/{id}/approve
     """
+    if event.get("Records"):
+        return _process_records(event["Records"])
+
     ticket_id = None
+    claims: Dict[str, Any] = {}
     try:
         # Extract user context for audit trails
-        user_context = extract_user_context(event)
+        claims = _jwt_claims(event)
+        user_context = extract_user_context(event, claims)
         if user_context:
             logger.info(f"[AI] Bedrock Agent processing request from user: {user_context['email']} (ID: {user_context['userId']})")
         else:
@@ -100,7 +164,7 @@ def lambda_handler(event, _context):
         return _resp(200, result)
 
     except Exception as e:
-        user_email = event.get('requestContext', {}).get('authorizer', {}).get('jwt', {}).get('claims', {}).get('email', 'unknown')
+        user_email = claims.get('email', 'unknown')
         logger.exception(f"[AI] Handler error for {ticket_id or 'unknown'} (user: {user_email}): {e}")
         return _resp(500, {
             "error": "Internal server error",
@@ -110,6 +174,225 @@ def lambda_handler(event, _context):
         })
 
 
+# ---------------------------
+# SQS batch path
+# ---------------------------
+def _record_ticket_id(record: Dict[str, Any]) -> Optional[str]:
+    body = record.get("body") or ""
+    try:
+        payload = json.loads(body)
+    except ValueError:
+        return body.strip() or None
+    if isinstance(payload, dict):
+        return payload.get("ticketId") or payload.get("id")
+    return str(payload) if payload else None
+
+
+def _process_records(records: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    SQS-triggered path: decide every ticket in the batch, then persist them in
+    one bulk write. Failed records are reported back as batchItemFailures.
+    """
+    failures: List[Dict[str, str]] = []
+    pending: List[Tuple[str, Dict[str, Any]]] = []
+    message_ids: Dict[str, List[str]] = {}
+
+    for record in records:
+        message_id = record.get("messageId", "")
+        ticket_id = _record_ticket_id(record)
+        if not ticket_id:
+            logger.warning(f"[AI] Skipping SQS record {message_id}: no ticket ID in body")
+            failures.append({"itemIdentifier": message_id})
+            continue
+        if ticket_id not in message_ids:
+            try:
+                result = LogicCartAIAgent().process_request(ticket_id, persist=False)
+            except Exception:
+                # Already logged by process_request; nothing is written or sent for this record
+                failures.append({"itemIdentifier": message_id})
+                continue
+            pending.append((ticket_id, result))
+        message_ids.setdefault(ticket_id, []).append(message_id)
+
+    written = write_results_bulk(pending)
+    for ticket_id, ok in written.items():
+        if not ok:
+            failures.extend({"itemIdentifier": m} for m in message_ids[ticket_id])
+
+    logger.info(f"[AI] Processed {len(records)} SQS record(s); {len(failures)} failed")
+    return {"batchItemFailures": failures}
+
+
+# ---------------------------
+# Email templates (parsed once; filled with str.format_map)
+# ---------------------------
+class _TemplateFields(dict):
+    """Ticket fields for email templates; a missing key renders as an empty string."""
+
+    def __missing__(self, key: str) -> str:
+        return ""
+
+
+def _page_urls_text(ticket: Dict[str, Any]) -> str:
+    page_urls = ticket.get("page_urls", [])
+    if isinstance(page_urls, list) and page_urls:
+        return ", ".join(page_urls)
+    if isinstance(page_urls, str):
+        return page_urls
+    return "(from form)"
+
+
+_APPROVE_EMAIL_BODY = """Hello {requester_name},
+
+Great news! Your new banner request has been approved and is ready for implementation.
+
+Approval Summary:
+{bullet}
+
+Next Steps:
+• Your banner will be implemented by your target go-live date.
+• You'll receive a confirmation email once it's live on the website
+• No further action is required from you at this time
+
+Implementation Details:
+• Impacted Page Area: {page_area}
+• Impacted Page URL(s): {urls_text}
+• Target Go-live Date: {launch_date}
+• Description: {description}
+• English Content: {copy_en}
+• Chinese Content: {copy_zh}
+
+Approved Images:
+{images_section}
+
+Questions?
+Contact us at dev@logiccart.com
+
+Best regards,
+LogicCart Web Development Team
+
+---
+Request ID: {id}
+Approved: {now} UTC
+"""
+
+_NEEDS_INFO_EMAIL_BODY = """Hello {requester_name},
+
+Thank you for submitting your new banner request. To finalize approval, please review:
+
+{bullet}
+
+Implementation Details:
+• Impacted Page Area: {page_area}
+• Impacted Page URL(s): {urls_text}
+• Target Go-live Date: {launch_date}
+• Description: {description}
+• English Content: {copy_en}
+• Chinese Content: {copy_zh}
+
+Submitted Images:
+{images_section}
+
+Once updated or clarified, please resubmit and we’ll complete the review.
+
+Questions?
+Contact us at dev@logiccart.com
+
+Best regards,
+LogicCart Web Development Team
+
+---
+Request ID: {id}
+Submitted: {created_at}
+"""
+
+_REJECT_EMAIL_BODY = """Hello {requester_name},
+
+Thank you for submitting your new banner request. Unfortunately, we cannot approve it in its current form due to the following policy violations:
+
+Issues Found:
+{bullet}
+
+Recommendations:
+• Review our brand guidelines at https://logiccart.com/brand-guidelines
+• Ensure images meet professional quality standards (high resolution, no blur/pixelation)
+• Use colors that complement LogicCart's purple theme (#5754FF)
+• Verify content is appropriate for our e-commerce platform
+• Check that URLs point to approved LogicCart domains only
+
+Implementation Details:
+• Impacted Page Area: {page_area}
+• Impacted Page URL(s): {urls_text}
+• Target Go-live Date: {launch_date}
+• Description: {description}
+• English Content: {copy_en}
+• Chinese Content: {copy_zh}
+
+Submitted Images:
+{images_section}
+
+Next Steps:
+• Address the issues listed above
+• Resubmit your request with updated materials
+
+Questions?
+Contact us at dev@logiccart.com
+
+
+Best regards,
+LogicCart Web Development Team
+
+---
+Request ID: {id}
+Reviewed: {now} UTC
+"""
+
+_FEATURE_EMAIL_BODY = """Hello {requester_name},
+
+Thank you for submitting your new feature request. To ensure we build exactly what you need, please provide the following information:
+
+Request Summary:
+• Request Type: New Feature
+• Department: {department}
+• Impacted Page Area: {page_area}
+• Impacted Page URLs: {urls_text}
+• Target Go-live Date: {launch_date}
+• Description: {description}
+• English Content: {copy_en}
+• Chinese Content: {copy_zh}
+
+Additional Information Required:
+
+1. Visual Design
+• Reference images, wireframes or mockups showing the ideal user interface
+• Figma links or design specifications if applicable
+• Mobile and desktop layouts if applicable
+
+2. Technical Specifications
+• What data needs to be stored or retrieved?
+• Any integrations with existing systems?
+• Performance or scalability requirements?
+
+3. Success Metrics
+• How will we measure if this feature is successful?
+• Expected user engagement or business impact?
+• Any specific KPIs or targets?
+
+Next Steps:
+Please reply to this email with the above information. Once received, our development team will review and provide a timeline estimate.
+
+Questions?
+Contact us at dev@logiccart.com
+
+Best regards,
+LogicCart Web Development Team
+
+---
+Request ID: {id}
+Submitted: {created_at}
+"""
+
+
 class LogicCartAIAgent:
     """
     Orchestrates:
@@ -119,14 +402,38 @@ class LogicCartAIAgent:
       4) Persist result (DynamoDB + optional SNS)
     """
 
+    # Per-request state only; the analyzer is a module singleton (see nova_analyzer)
+    __slots__ = ("_url_cache", "_stamp")
+
     def __init__(self):
-        self.nova_analyzer = create_nova_lite_analyzer()
+        # s3Key -> presigned URL (or None); one agent per request, so each asset is signed once
+        self._url_cache: Dict[str, Optional[str]] = {}
+        # Email timestamp, taken once in process_request so every builder agrees
+        self._stamp: Optional[str] = None
+
+    def _presigned_url(self, s3_key: str) -> Optional[str]:
+        if s3_key not in self._url_cache:
+            self._url_cache[s3_key] = get_banner_image_url(s3_key)
+        return self._url_cache[s3_key]
 
-    def process_request(self, ticket_id: str, user_context: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+    def _email_stamp(self) -> str:
+        return self._stamp or datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
+
+    @property
+    def nova_analyzer(self):
+        return _get_nova_analyzer()
+
+    def process_request(
+        self,
+        ticket_id: str,
+        user_context: Optional[Dict[str, str]] = None,
+        persist: bool = True,
+    ) -> Dict[str, Any]:
+        now = datetime.now(timezone.utc)
+        self._stamp = now.strftime('%Y-%m-%d %H:%M:%S')
         try:
             ticket = get_ticket(ticket_id)
             request_type = ticket.get("request_type", "UNKNOWN")
-            policy_text = get_policy(POLICY_FILE_KEY)
 
             # Log user context for audit trails
             if user_context:
@@ -135,14 +442,14 @@ class LogicCartAIAgent:
                 logger.info(f"[AI] Processing {request_type} request {ticket_id} (no user context available)")
 
             if request_type == "NEW_BANNER":
-                result = self._process_banner(ticket, policy_text)
+                result = self._process_banner(ticket)
             elif request_type == "NEW_FEATURE":
-                result = self._process_feature(ticket, policy_text)
+                result = self._process_feature(ticket)
             else:
                 result = self._needs_info([f"Unknown request type: {request_type}", "Manual review required"], 0.0)
 
             # Attach metadata and persist
-            result["processed_at"] = datetime.utcnow().isoformat() + "Z"
+            result["processed_at"] = now.isoformat(timespec="microseconds")[:-6] + "Z"
             result["ticket_id"] = ticket_id
             result["request_type"] = request_type
             result["ai_analysis"] = True
@@ -156,19 +463,23 @@ class LogicCartAIAgent:
                     "username": user_context.get("username", "")
                 }
 
-            write_result(ticket_id, result)
+            if persist:
+                write_result(ticket_id, result)
             logger.info(f"[AI] Decision for {ticket_id}: {result.get('decision')} ({result.get('confidence')}) - User: {user_context['email'] if user_context else 'unknown'}")
             return result
 
         except Exception as e:
             user_email = user_context['email'] if user_context else 'unknown'
             logger.exception(f"[AI] process_request failed for user {user_email}: {e}")
+            if not persist:
+                # Batch callers must not store or notify a placeholder decision; let them retry
+                raise
             return self._needs_info([f"System error: {str(e)}", "Manual review required"], 0.0)
 
     # ---------------------------
     # NEW_BANNER (policy-aligned)
     # ---------------------------
-    def _process_banner(self, ticket: Dict[str, Any], policy_text: str) -> Dict[str, Any]:
+    def _process_banner(self, ticket: Dict[str, Any]) -> Dict[str, Any]:
         """
         Policy focus ONLY (skip frontend-validated checks):
           - Visual Content Quality (professional look, no blur/compression, etc.)
@@ -185,7 +496,9 @@ class LogicCartAIAgent:
             return self._reject(url_status["reject_reasons"], confidence=0.9, analysis_method="policy_url_check")
         reasons.extend(url_status["needs_info_reasons"])  # e.g., possible redirect shorteners
 
-        # 2) Visual Analysis via Nova Lite
+        # 2) Visual Analysis via Nova Lite (the only consumer of the policy text).
+        # In-memory per container; revalidated against the S3 ETag once the TTL lapses
+        policy_text = get_policy_cached(POLICY_FILE_KEY)
         visual = self._run_visual_analysis(ticket, policy_text)
 
         # If no assets accessible -> Needs Info (visual focus cannot be applied)
@@ -210,23 +523,20 @@ class LogicCartAIAgent:
         needs_info_reasons: List[str] = []
 
         for url in urls:
-            if not url:
+            if not url or url.startswith(_FAST_APPROVED_PREFIXES):
                 continue
             try:
                 parsed = urlparse(url)
                 host = (parsed.netloc or "").lower()
 
                 # Approved domain check (exact host or subdomain)
-                approved = host in APPROVED_DOMAINS or any(
-                    host == d or host.endswith(f".{d}") for d in APPROVED_DOMAINS
-                )
-                if not approved:
+                if not (host in _APPROVED_SET or host.endswith(_APPROVED_SUFFIXES)):
                     reject_reasons.append(f"Non-approved URL domain: {url}")
                     continue
 
                 # Redirect hints (cannot fully resolve in Lambda cheaply—flag for verification)
                 # Only flag if the host contains redirect hints AND it's not our approved domain
-                if any(hint in host for hint in REDIRECT_HOST_HINTS) and host not in APPROVED_DOMAINS:
+                if host not in _APPROVED_SET and _REDIRECT_HINT_RE.search(host):
                     needs_info_reasons.append(f"URL might be an external redirect: {url}")
 
             except Exception:
@@ -241,7 +551,7 @@ class LogicCartAIAgent:
         for a in assets:
             key = a.get("s3Key")
             if key:
-                url = get_banner_image_url(key)
+                url = self._presigned_url(key)
                 if url:
                     image_urls.append(url)
 
@@ -287,17 +597,18 @@ class LogicCartAIAgent:
 
         # Poor visual quality → REJECT (only for very poor quality)
         if quality_score <= 0.3 or any(k for k in issues if _looks_like_quality_blocker(k)):
-            reasons.extend(_trim_to_fit(issues, max_items=5 - len(reasons)))
+            # prior_reasons (one per flagged URL) may already fill or exceed the 5 slots
+            reasons.extend(_trim_to_fit(issues, max_items=max(0, 5 - len(reasons))))
             return self._reject(reasons[:5], confidence=max(0.7, confidence_ai), analysis_method="policy_visual", ticket=ticket)
 
         # Brand alignment - more flexible color detection
-        colors = [c.upper() for c in (visual.get("colors_detected") or [])]
+        colors = {c.upper() for c in (visual.get("colors_detected") or ())}
         # Check for LogicCart purple or complementary colors (blues, purples, similar hues)
-        brand_colors = ["#5754FF", "#5E60F1", "#6366F1", "#8B5CF6", "#A855F7", "#C084FC"]
-        has_brand_color = any(c in colors for c in brand_colors) or any(
-            any(brand in c for brand in ["5754", "5E60", "6366", "8B5C", "A855", "C084"]) for c in colors
+        has_brand_color = not colors.isdisjoint(_BRAND_COLORS) or any(
+            fragment in c for c in colors for fragment in _BRAND_HEX_FRAGMENTS
         )
-        is_festival = "festival" in (ticket.get("title", "") + " " + ticket.get("description", "")).lower()
+        # Title is checked first; the description is only lowercased when the title has no match
+        is_festival = "festival" in ticket.get("title", "").lower() or "festival" in ticket.get("description", "").lower()
 
         # More lenient AUTO-APPROVE criteria (policy-aligned)
         # Professional quality (lowered threshold), appropriate content, reasonable brand alignment
@@ -336,8 +647,9 @@ class LogicCartAIAgent:
 
         # Only send NEEDS_INFO if there are actual specific issues to address
         if needs_info_reasons:
-            email = self._banner_needs_info_email(ticket, needs_info_reasons)
-            return self._needs_info(_trim_to_fit(needs_info_reasons), confidence=max(0.6, confidence_ai), email=email,
+            trimmed = _trim_to_fit(needs_info_reasons)
+            email = self._banner_needs_info_email(ticket, trimmed)
+            return self._needs_info(trimmed, confidence=max(0.6, confidence_ai), email=email,
                                     analysis_method="policy_visual")
 
         # Final fallback - approve if content is appropriate
@@ -345,13 +657,13 @@ class LogicCartAIAgent:
             ["Content appropriate", "No major policy violations"],
             confidence=max(0.6, confidence_ai),
             analysis_method="policy_visual",
-            tet=tic
+            ticket=ticket
         )
 
     # ---------------------------
     # NEW_FEATURE (always Needs Info)
     # ---------------------------
-    def _process_feature(self, ticket: Dict[str, Any], policy_text: str) -> Dict[str, Any]:
+    def _process_feature(self, ticket: Dict[str, Any]) -> Dict[str, Any]:
         """Always return NEEDS_INFO with the policy’s guidance email template."""
         email = self._feature_email_from_policy(ticket)
         return {
@@ -372,231 +684,68 @@ class LogicCartAIAgent:
         for asset in assets:
             s3_key = asset.get("s3Key")
             if s3_key:
-                image_url = get_banner_image_url(s3_key)
+                image_url = self._presigned_url(s3_key)
                 if image_url:
                     image_urls.append(f"• {asset.get('filename', 'Image')}: {image_url}")
         
         return "\n".join(image_urls) if image_urls else "• No images attached"
     def _banner_approve_email(self, ticket: Dict[str, Any], reasons: List[str]) -> Dict[str, str]:
         subject = f"New Request {ticket.get('id','')} - Approved"
-        bullet = "\n".join(f"• {r}" for r in _trim_to_fit(reasons))
-        
-        # Get S3 image URLs
-        image_urls = []
-        assets = ticket.get("assets") or []
-        for asset in assets:
-            s3_key = asset.get("s3Key")
-            if s3_key:
-                image_url = get_banner_image_url(s3_key)
-                if image_url:
-                    image_urls.append(f"• {asset.get('filename', 'Image')}: {image_url}")
-        
-        images_section = "\n".join(image_urls) if image_urls else "• No images attached"
-        
-        # Format page URLs
-        page_urls = ticket.get("page_urls", [])
-        if isinstance(page_urls, list) and page_urls:
-            urls_text = ", ".join(page_urls)
-        elif isinstance(page_urls, str):
-            urls_text = page_urls
-        else:
-            urls_text = "(from form)"
-
-        body = f"""Hello {ticket.get('requester_name','there')},
-
-Great news! Your new banner request has been approved and is ready for implementation.
-
-Approval Summary:
-{bullet}
-
-Next Steps:
-• Your banner will be implemented by your target go-live date.
-• You'll receive a confirmation email once it's live on the website
-• No further action is required from you at this time
-
-Implementation Details:
-• Impacted Page Area: {ticket.get('page_area', '')}
-• Impacted Page URL(s): {urls_text}
-• Target Go-live Date: {ticket.get('launch_date', '')}
-• Description: {ticket.get('description', '')}
-• English Content: {ticket.get('copy_en')}
-• Chinese Content: {ticket.get('copy_zh')}
-
-Approved Images:
-{images_section}
-
-Questions?
-Contact us at dev@logiccart.com
-
-Best regards,
-LogicCart Web Development Team
-
----
-Request ID: {ticket.get('id','')}
-Approved: {datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')} UTC
-"""
-        return {"subject": subject, "body": body}
+        fields = _TemplateFields(ticket)
+        fields["bullet"] = _bullet_list(reasons)
+        fields["images_section"] = self._get_image_urls_section(ticket)
+        fields["urls_text"] = _page_urls_text(ticket)
+        fields["now"] = self._email_stamp()
+        return {"subject": subject, "body": _APPROVE_EMAIL_BODY.format_map(fields)}
 
     def _banner_needs_info_email(self, ticket: Dict[str, Any], reasons: List[str]) -> Dict[str, str]:
         subject = f"New Request {ticket.get('id','')} - Additional Information Required"
-        bullet = "\n".join(f"• {r}" for r in _trim_to_fit(reasons))
-        body = f"""Hello {ticket.get('requester_name','there')},
-
-Thank you for submitting your new banner request. To finalize approval, please review:
-
-{bullet}
-
-Implementation Details:
-• Impacted Page Area: {ticket.get('page_area', '(from form)')}
-• Impacted Page URL(s): {', '.join(ticket.get('page_urls', [])) if ticket.get('page_urls') else '(from form)'}
-• Target Go-live Date: {ticket.get('launch_date', '(from form)')}
-• Description: {ticket.get('description', '')}
-• English Content: {ticket.get('copy_en')}
-• Chinese Content: {ticket.get('copy_zh')}
-
-Submitted Images:
-{self._get_image_urls_section(ticket)}
-
-Once updated or clarified, please resubmit and we’ll complete the review.
-
-Questions?
-Contact us at dev@logiccart.com
-
-Best regards,
-LogicCart Web Development Team
-
----
-Request ID: {ticket.get('id','')}
-Submitted: {ticket.get('created_at','')}
-"""
-        return {"subject": subject, "body": body}
+        fields = _TemplateFields(ticket)
+        fields["bullet"] = _bullet_list(reasons)
+        fields["images_section"] = self._get_image_urls_section(ticket)
+        fields["urls_text"] = ', '.join(ticket.get('page_urls', [])) if ticket.get('page_urls') else '(from form)'
+        return {"subject": subject, "body": _NEEDS_INFO_EMAIL_BODY.format_map(fields)}
 
     def _banner_reject_email(self, ticket: Dict[str, Any], reasons: List[str]) -> Dict[str, str]:
         subject = f"New Request {ticket.get('id','')} - Not Approved"
-        bullet = "\n".join(f"• {r}" for r in _trim_to_fit(reasons))
-        body = f"""Hello {ticket.get('requester_name','there')},
-
-Thank you for submitting your new banner request. Unfortunately, we cannot approve it in its current form due to the following policy violations:
-
-Issues Found:
-{bullet}
-
-Recommendations:
-• Review our brand guidelines at https://logiccart.com/brand-guidelines
-• Ensure images meet professional quality standards (high resolution, no blur/pixelation)
-• Use colors that complement LogicCart's purple theme (#5754FF)
-• Verify content is appropriate for our e-commerce platform
-• Check that URLs point to approved LogicCart domains only
-
-Implementation Details:
-• Impacted Page Area: {ticket.get('page_area', '(from form)')}
-• Impacted Page URL(s): {', '.join(ticket.get('page_urls', [])) if ticket.get('page_urls') else '(from form)'}
-• Target Go-live Date: {ticket.get('launch_date', '(from form)')}
-• Description: {ticket.get('description', '')}
-• English Content: {ticket.get('copy_en')}
-• Chinese Content: {ticket.get('copy_zh')}
-
-Submitted Images:
-{self._get_image_urls_section(ticket)}
-
-Next Steps:
-• Address the issues listed above
-• Resubmit your request with updated materials
-
-Questions?
-Contact us at dev@logiccart.com
-
-
-Best regards,
-LogicCart Web Development Team
-
----
-Request ID: {ticket.get('id','')}
-Reviewed: {datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')} UTC
-"""
-        return {"subject": subject, "body": body}
+        fields = _TemplateFields(ticket)
+        fields["bullet"] = _bullet_list(reasons)
+        fields["images_section"] = self._get_image_urls_section(ticket)
+        fields["urls_text"] = ', '.join(ticket.get('page_urls', [])) if ticket.get('page_urls') else '(from form)'
+        fields["now"] = self._email_stamp()
+        return {"subject": subject, "body": _REJECT_EMAIL_BODY.format_map(fields)}
 
     def _feature_email_from_policy(self, ticket: Dict[str, Any]) -> Dict[str, str]:
         subject = f"New Request {ticket.get('id','')} - Additional Information Required"
-        
-        # Format page URLs properly
-        page_urls = ticket.get("page_urls", [])
-        if isinstance(page_urls, list) and page_urls:
-            urls_text = ", ".join(page_urls)
-        elif isinstance(page_urls, str):
-            urls_text = page_urls
-        else:
-            urls_text = "(from form)"
-
-        body = f"""Hello {ticket.get('requester_name', 'there')},
-
-Thank you for submitting your new feature request. To ensure we build exactly what you need, please provide the following information:
-
-Request Summary:
-• Request Type: New Feature
-• Department: {ticket.get('department')}
-• Impacted Page Area: {ticket.get('page_area')}
-• Impacted Page URLs: {urls_text}
-• Target Go-live Date: {ticket.get('launch_date')}
-• Description: {ticket.get('description', '')}
-• English Content: {ticket.get('copy_en')}
-• Chinese Content: {ticket.get('copy_zh')}
-
-Additional Information Required:
-
-1. Visual Design
-• Reference images, wireframes or mockups showing the ideal user interface
-• Figma links or design specifications if applicable
-• Mobile and desktop layouts if applicable
-
-2. Technical Specifications
-• What data needs to be stored or retrieved?
-• Any integrations with existing systems?
-• Performance or scalability requirements?
-
-3. Success Metrics
-• How will we measure if this feature is successful?
-• Expected user engagement or business impact?
-• Any specific KPIs or targets?
-
-Next Steps:
-Please reply to this email with the above information. Once received, our development team will review and provide a timeline estimate.
-
-Questions?
-Contact us at dev@logiccart.com
-
-Best regards,
-LogicCart Web Development Team
-
----
-Request ID: {ticket.get('id', '')}
-Submitted: {ticket.get('created_at', '')}
-"""
-        return {"subject": subject, "body": body}
+        fields = _TemplateFields(ticket)
+        fields["urls_text"] = _page_urls_text(ticket)
+        return {"subject": subject, "body": _FEATURE_EMAIL_BODY.format_map(fields)}
 
     # ---------------------------
     # Response helpers
     # ---------------------------
     def _approve(self, reasons: List[str], confidence: float, analysis_method: str, ticket: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        trimmed = _trim_to_fit(reasons)
         result = {
             "decision": "APPROVE",
-            "reasons": _trim_to_fit(reasons),
+            "reasons": trimmed,
             "confidence": min(1.0, max(0.0, confidence)),
             "analysis_method": analysis_method,
         }
         if ticket:
-            result["email"] = self._banner_approve_email(ticket, reasons)
+            result["email"] = self._banner_approve_email(ticket, trimmed)
         return result
 
     def _reject(self, reasons: List[str], confidence: float, analysis_method: str, ticket: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        trimmed = _trim_to_fit(reasons)
         result = {
             "decision": "REJECT",
-            "reasons": _trim_to_fit(reasons),
+            "reasons": trimmed,
             "confidence": min(1.0, max(0.0, confidence)),
             "analysis_method": analysis_method,
         }
         if ticket:
-            result["email"] = self._banner_reject_email(ticket, reasons)
+            result["email"] = self._banner_reject_email(ticket, trimmed)
         return result
 
     def _needs_info(
@@ -621,16 +770,27 @@ Submitted: {ticket.get('created_at', '')}
 # Small utilities (pure)
 # ---------------------------
 def _trim_to_fit(items: List[str], max_items: int = 5) -> List[str]:
-    return [s for s in items if s][:max_items]
+    # Stops after max_items truthy entries instead of filtering the whole list
+    return list(islice(filter(None, items), max_items))
+
+
+def _bullet_list(reasons: List[str]) -> str:
+    """Email bullet block; callers pass reasons already cut down by _trim_to_fit."""
+    return "\n".join(f"• {r}" for r in reasons)
+
+
+# Policy 'poor image quality' keywords, one case-insensitive scan per issue
+_QUALITY_BLOCKER_RE = re.compile(
+    "|".join((
+        "blurry", "blur", "pixelation", "pixelated", "compression", "artifact",
+        "low resolution", "poor resolution", "noisy", "distortion",
+    )),
+    re.IGNORECASE,
+)
 
 
 def _looks_like_quality_blocker(text: str) -> bool:
     """
     Heuristic to map model issues to policy 'poor image quality' bucket.
     """
-    t = (text or "").lower()
-    keywords = [
-        "blurry", "blur", "pixelation", "pixelated", "compression", "artifact",
-        "low resolution", "poor resolution", "noisy", "distortion"
-    ]
-    return any(k in t for k in keywords)
+    return bool(_QUALITY_BLOCKER_RE.search(text or ""))
@@ -11,11 +11,16 @@ import json
 import logging
 import os
 import sys
-import traceback
+import time
 from datetime import datetime, timezone
 from enum import Enum
 from typing import Any, Dict, List, Optional
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
 
 # ---------- Enums ---------- #
 
@@ -39,8 +44,57 @@ class LogCategory(Enum):
     COST_TRACKING = "cost_tracking"
 
 
+# Category strings resolved once; emitters use these instead of LogCategory.X.value per call
+_CAT_AGENT_PROCESSING = LogCategory.AGENT_PROCESSING.value
+_CAT_MODEL_OUTPUT = LogCategory.MODEL_OUTPUT.value
+_CAT_TOOL_ERROR = LogCategory.TOOL_ERROR.value
+_CAT_DECISION_REASONING = LogCategory.DECISION_REASONING.value
+_CAT_FALLBACK_ANALYSIS = LogCategory.FALLBACK_ANALYSIS.value
+_CAT_ERROR_HANDLING = LogCategory.ERROR_HANDLING.value
+_CAT_PERFORMANCE = LogCategory.PERFORMANCE.value
+_CAT_SECURITY = LogCategory.SECURITY.value
+_CAT_COST_TRACKING = LogCategory.COST_TRACKING.value
+
+
 # ---------- JSON Formatter ---------- #
 
+# Extras promoted right after the base fields, in this order
+_COMMON_EXTRA_KEYS = (
+    "category",
+    "ticket_id",
+    "request_type",
+    "model",
+    "decision",
+    "confidence",
+    "processing_time_ms",
+    "error_type",
+    "fallback_reason",
+)
+
+# Standard LogRecord attributes that are never copied as extras
+_RESERVED_LOGRECORD_ATTRS = frozenset((
+    "name",
+    "msg",
+    "levelname",
+    "levelno",
+    "pathname",
+    "filename",
+    "module",
+    "lineno",
+    "funcName",
+    "created",
+    "msecs",
+    "relativeCreated",
+    "thread",
+    "threadName",
+    "processName",
+    "process",
+    "exc_info",
+    "exc_text",
+    "stack_info",
+))
+
+
 class CloudWatchJSONFormatter(logging.Formatter):
     """
     JSON formatter for CloudWatch logs.
@@ -48,10 +102,28 @@ class CloudWatchJSONFormatter(logging.Formatter):
     """
 
     def format(self, record: logging.LogRecord) -> str:
+        entry = self._entry(record)
+        if orjson is not None:
+            try:
+                return orjson.dumps(entry, default=str).decode()
+            except TypeError:
+                # Non-str dict keys or out-of-range ints in extras: keep the stdlib behaviour
+                pass
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+    def format_bytes(self, record: logging.LogRecord) -> bytes:
+        """Same JSON as format(), as UTF-8 bytes (skips orjson's decode for binary streams)."""
+        entry = self._entry(record)
+        if orjson is not None:
+            try:
+                return orjson.dumps(entry, default=str)
+            except TypeError:
+                pass
+        return json.dumps(entry, ensure_ascii=False, default=str).encode("utf-8")
+
+    def _entry(self, record: logging.LogRecord) -> Dict[str, Any]:
         entry: Dict[str, Any] = {
-            "timestamp": datetime.fromtimestamp(record.created, timezone.utc)
-            .isoformat()
-            .replace("+00:00", "Z"),
+            "timestamp": _iso_from_epoch(record.created),
             "level": record.levelname,
             "logger": record.name,
             "message": record.getMessage(),
@@ -61,17 +133,7 @@ class CloudWatchJSONFormatter(logging.Formatter):
         }
 
         # Common extras
-        for key in (
-            "category",
-            "ticket_id",
-            "request_type",
-            "model",
-            "decision",
-            "confidence",
-            "processing_time_ms",
-            "error_type",
-            "fallback_reason",
-        ):
+        for key in _COMMON_EXTRA_KEYS:
             if hasattr(record, key):
                 entry[key] = getattr(record, key)
 
@@ -81,27 +143,7 @@ class CloudWatchJSONFormatter(logging.Formatter):
                 continue
             if k.startswith(("_", "args")):
                 continue
-            if k in {
-                "name",
-                "msg",
-                "levelname",
-                "levelno",
-                "pathname",
-                "filename",
-                "module",
-                "lineno",
-                "funcName",
-                "created",
-                "msecs",
-                "relativeCreated",
-                "thread",
-                "threadName",
-                "processName",
-                "process",
-                "exc_info",
-                "exc_text",
-                "stack_info",
-            }:
+            if k in _RESERVED_LOGRECORD_ATTRS:
                 continue
             entry.setdefault(k, v)
 
@@ -109,7 +151,44 @@ class CloudWatchJSONFormatter(logging.Formatter):
         if record.exc_info:
             entry["exception"] = self.formatException(record.exc_info)
 
-        return json.dumps(entry, ensure_ascii=False, default=str)
+        return entry
+
+
+class _BytesStreamHandler(logging.StreamHandler):
+    """
+    StreamHandler that writes each record to the binary buffer under a text
+    stream (sys.stdout.buffer) in one write, skipping the TextIOWrapper encode.
+    Streams without a .buffer (e.g. io.StringIO in tests) get the normal text path.
+    """
+
+    def __init__(self, stream: Any = None) -> None:
+        super().__init__(stream if stream is not None else sys.stdout)
+        self._binary: Optional[Any] = getattr(self.stream, "buffer", None)
+
+    def setStream(self, stream: Any) -> Any:
+        old = super().setStream(stream)
+        self._binary = getattr(self.stream, "buffer", None)
+        return old
+
+    def emit(self, record: logging.LogRecord) -> None:
+        binary = self._binary
+        if binary is None:
+            super().emit(record)
+            return
+        try:
+            fmt = self.formatter
+            if isinstance(fmt, CloudWatchJSONFormatter):
+                data = fmt.format_bytes(record)
+            else:
+                data = self.format(record).encode("utf-8")
+            # Anything print()ed since the last record must land first
+            self.stream.flush()
+            binary.write(data + b"\n")
+            binary.flush()
+        except RecursionError:  # See issue 36272
+            raise
+        except Exception:
+            self.handleError(record)
 
 
 # ---------- Structured Logger ---------- #
@@ -126,7 +205,7 @@ class StructuredLogger:
         # Avoid duplicate handlers in Lambda warm starts
         if not self.logger.handlers:
             self.logger.setLevel(logging.INFO)
-            handler = logging.StreamHandler(sys.stdout)
+            handler = _BytesStreamHandler(sys.stdout)
             handler.setFormatter(CloudWatchJSONFormatter())
             self.logger.addHandler(handler)
 
@@ -137,35 +216,37 @@ class StructuredLogger:
 
         self.logger.info(
             "StructuredLogger initialized",
-            extra={"category": LogCategory.AGENT_PROCESSING.value, "log_level": level_name},
+            extra={"category": _CAT_AGENT_PROCESSING, "log_level": level_name},
         )
 
     # --- Convenience emitters ---
 
     def log_agent_start(self, ticket_id: str, request_type: str, model: str) -> None:
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
         self.logger.info(
             "Agent processing started",
             extra={
-                "category": LogCategory.AGENT_PROCESSING.value,
+                "category": _CAT_AGENT_PROCESSING,
                 "ticket_id": ticket_id,
                 "request_type": request_type,
                 "model": model,
-                "timestamp": _iso_now(),
             },
         )
 
     def log_agent_completion(
         self, ticket_id: str, decision: str, confidence: float, processing_time_ms: float
     ) -> None:
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
         self.logger.info(
             "Agent processing completed",
             extra={
-                "category": LogCategory.AGENT_PROCESSING.value,
+                "category": _CAT_AGENT_PROCESSING,
                 "ticket_id": ticket_id,
                 "decision": decision,
                 "confidence": confidence,
                 "processing_time_ms": processing_time_ms,
-                "timestamp": _iso_now(),
             },
         )
 
@@ -178,18 +259,19 @@ class StructuredLogger:
         raw_output: str,
         parsed_successfully: bool,
     ) -> None:
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
         self.logger.info(
             "Model output received",
             extra={
-                "category": LogCategory.MODEL_OUTPUT.value,
+                "category": _CAT_MODEL_OUTPUT,
                 "ticket_id": ticket_id,
                 "model": model,
                 "input_tokens": input_tokens,
                 "output_tokens": output_tokens,
                 "output_length": len(raw_output),
                 "parsed_successfully": parsed_successfully,
-                "raw_output_preview": (raw_output[:500] + "...") if len(raw_output) > 500 else raw_output,
-                "timestamp": _iso_now(),
+                "raw_output_preview": _Preview(raw_output, 500),
             },
         )
 
@@ -201,10 +283,12 @@ class StructuredLogger:
         confidence: float,
         analysis_details: Dict[str, Any],
     ) -> None:
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
         self.logger.info(
             "Decision reasoning",
             extra={
-                "category": LogCategory.DECISION_REASONING.value,
+                "category": _CAT_DECISION_REASONING,
                 "ticket_id": ticket_id,
                 "decision": decision,
                 "reasons": reasons,
@@ -213,36 +297,37 @@ class StructuredLogger:
                 "mechanical_score": analysis_details.get("mechanical_score"),
                 "visual_score": analysis_details.get("visual_score"),
                 "content_score": analysis_details.get("content_score"),
-                "timestamp": _iso_now(),
             },
         )
 
     def log_fallback_analysis(self, ticket_id: str, reason: str, fallback_method: str, confidence: float) -> None:
+        if not self.logger.isEnabledFor(logging.WARNING):
+            return
         self.logger.warning(
             "Fallback analysis activated",
             extra={
-                "category": LogCategory.FALLBACK_ANALYSIS.value,
+                "category": _CAT_FALLBACK_ANALYSIS,
                 "ticket_id": ticket_id,
                 "fallback_reason": reason,
                 "fallback_method": fallback_method,
                 "confidence": confidence,
-                "timestamp": _iso_now(),
             },
         )
 
     def log_tool_error(
         self, ticket_id: str, tool_name: str, error_message: str, error_type: str, retry_count: int = 0
     ) -> None:
+        if not self.logger.isEnabledFor(logging.ERROR):
+            return
         self.logger.error(
             "Tool execution error",
             extra={
-                "category": LogCategory.TOOL_ERROR.value,
+                "category": _CAT_TOOL_ERROR,
                 "ticket_id": ticket_id,
                 "tool_name": tool_name,
                 "error_message": error_message,
                 "error_type": error_type,
                 "retry_count": retry_count,
-                "timestamp": _iso_now(),
             },
         )
 
@@ -254,71 +339,77 @@ class StructuredLogger:
         handling_strategy: str,
         result: Dict[str, Any],
     ) -> None:
+        if not self.logger.isEnabledFor(logging.WARNING):
+            return
         self.logger.warning(
             "Error handling activated",
             extra={
-                "category": LogCategory.ERROR_HANDLING.value,
+                "category": _CAT_ERROR_HANDLING,
                 "ticket_id": ticket_id,
                 "original_error": original_error,
                 "error_type": error_type,
                 "handling_strategy": handling_strategy,
                 "result_decision": result.get("decision"),
                 "manual_review_required": result.get("manual_review_required", False),
-                "timestamp": _iso_now(),
             },
         )
 
     def log_performance_metrics(self, ticket_id: str, metrics: Dict[str, Any]) -> None:
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
         self.logger.info(
             "Performance metrics",
             extra={
-                "category": LogCategory.PERFORMANCE.value,
+                "category": _CAT_PERFORMANCE,
                 "ticket_id": ticket_id,
                 "metrics": metrics,
-                "timestamp": _iso_now(),
             },
         )
 
     def log_cost_tracking(
         self, ticket_id: str, model: str, input_tokens: int, output_tokens: int, estimated_cost_usd: float
     ) -> None:
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
         self.logger.info(
             "Cost tracking",
             extra={
-                "category": LogCategory.COST_TRACKING.value,
+                "category": _CAT_COST_TRACKING,
                 "ticket_id": ticket_id,
                 "model": model,
                 "input_tokens": input_tokens,
                 "output_tokens": output_tokens,
                 "estimated_cost_usd": estimated_cost_usd,
-                "timestamp": _iso_now(),
             },
         )
 
     def log_security_event(self, ticket_id: str, event_type: str, details: Dict[str, Any]) -> None:
+        if not self.logger.isEnabledFor(logging.WARNING):
+            return
         self.logger.warning(
             "Security event",
             extra={
-                "category": LogCategory.SECURITY.value,
+                "category": _CAT_SECURITY,
                 "ticket_id": ticket_id,
                 "event_type": event_type,
                 "details": details,
-                "timestamp": _iso_now(),
             },
         )
 
     def log_exception(self, ticket_id: str, exception: Exception, context: str = "") -> None:
+        if not self.logger.isEnabledFor(logging.ERROR):
+            return
         self.logger.error(
             "Exception occurred",
             extra={
-                "category": LogCategory.ERROR_HANDLING.value,
+                "category": _CAT_ERROR_HANDLING,
                 "ticket_id": ticket_id,
                 "exception_type": type(exception).__name__,
                 "exception_message": str(exception),
                 "context": context,
-                "stack_trace": traceback.format_exc(),
-                "timestamp": _iso_now(),
             },
+            # Rendered by the formatter into "exception" only when the record is emitted
+            exc_info=(type(exception), exception, exception.__traceback__),
         )
 
 
@@ -382,7 +473,9 @@ class CostTracker:
 
     def __init__(self, logger: StructuredLogger) -> None:
         self.logger = logger
-        self._entries: List[Dict[str, Any]] = []
+        # Running totals only; per-call details already go out via log_cost_tracking
+        self._total_cost: float = 0.0
+        self._count: int = 0
 
     def calculate_model_cost(self, model: str, input_tokens: int, output_tokens: int) -> float:
         if "nova-lite" in model.lower():
@@ -394,38 +487,24 @@ class CostTracker:
 
     def track_model_usage(self, ticket_id: str, model: str, input_tokens: int, output_tokens: int) -> float:
         cost = self.calculate_model_cost(model, input_tokens, output_tokens)
-        self._entries.append(
-            {
-                "ticket_id": ticket_id,
-                "model": model,
-                "input_tokens": input_tokens,
-                "output_tokens": output_tokens,
-                "cost_usd": cost,
-                "timestamp": _iso_now(),
-            }
-        )
+        self._total_cost += cost
+        self._count += 1
         self.logger.log_cost_tracking(ticket_id, model, input_tokens, output_tokens, cost)
         return cost
 
     def get_session_total_cost(self) -> float:
-        return sum(e["cost_usd"] for e in self._entries)
+        return self._total_cost
 
     def get_daily_cost_estimate(self, requests_per_day: int = 100) -> float:
-        if not self._entries:
+        if not self._count:
             return 0.0
-        avg = self.get_session_total_cost() / max(len(self._entries), 1)
-        return avg * requests_per_day
+        return self._total_cost / self._count * requests_per_day
 
 
 # ---------- Global accessors ---------- #
 
-_global_logger: Optional[StructuredLogger] = None
-
-
 def get_logger() -> StructuredLogger:
-    global _global_logger
-    if _global_logger is None:
-        _global_logger = StructuredLogger()
+    # Created once at import (bottom of this module), so no lazy check or lock is needed
     return _global_logger
 
 
@@ -465,44 +544,91 @@ def log_function_call(category: LogCategory = LogCategory.AGENT_PROCESSING):
     Tries to infer ticket_id from kwargs['ticket_id'] or from an object
     on args[0] that has 'ticket_id' attribute.
     """
+    category_value = category.value
+
     def decorator(func):
+        logger = get_logger()
+        std_logger = logger.logger
+        fname = func.__name__
+        called_msg = f"Function {fname} called"
+        completed_msg = f"Function {fname} completed"
+        error_context = f"Function {fname}"
+
         def wrapper(*args, **kwargs):
-            logger = get_logger()
-            ticket_id = _extract_ticket_id(args, kwargs)
-
-            logger.logger.debug(
-                f"Function {func.__name__} called",
-                extra={
-                    "category": category.value,
-                    "ticket_id": ticket_id,
-                    "function": func.__name__,
-                    "args_count": len(args),
-                    "kwargs_keys": list(kwargs.keys()),
-                },
-            )
+            # Checked per call (isEnabledFor caches per level) so LOG_LEVEL changes still apply
+            debug = std_logger.isEnabledFor(logging.DEBUG)
+            if debug:
+                ticket_id = _extract_ticket_id(args, kwargs)
+                std_logger.debug(
+                    called_msg,
+                    extra={
+                        "category": category_value,
+                        "ticket_id": ticket_id,
+                        "function": fname,
+                        "args_count": len(args),
+                        "kwargs_keys": list(kwargs),
+                    },
+                )
             try:
                 result = func(*args, **kwargs)
-                logger.logger.debug(
-                    f"Function {func.__name__} completed",
+            except Exception as e:
+                logger.log_exception(_extract_ticket_id(args, kwargs), e, error_context)
+                raise
+            if debug:
+                std_logger.debug(
+                    completed_msg,
                     extra={
-                        "category": category.value,
+                        "category": category_value,
                         "ticket_id": ticket_id,
-                        "function": func.__name__,
+                        "function": fname,
                         "success": True,
                     },
                 )
-                return result
-            except Exception as e:
-                logger.log_exception(ticket_id, e, f"Function {func.__name__}")
-                raise
+            return result
         return wrapper
     return decorator
 
 
 # ---------- Helpers ---------- #
 
+# (whole epoch second, "YYYY-MM-DDTHH:MM:SS") of the last formatted timestamp; records
+# arrive in bursts, so most calls only append the milliseconds
+_LAST_SECOND = (-1, "")
+
+
+def _iso_from_epoch(t: float) -> str:
+    """Epoch seconds -> "YYYY-MM-DDTHH:MM:SS.mmmZ" (UTC, millisecond precision)."""
+    global _LAST_SECOND
+    sec = int(t)
+    cached_sec, prefix = _LAST_SECOND
+    if sec != cached_sec:
+        prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(sec))
+        _LAST_SECOND = (sec, prefix)
+    return f"{prefix}.{int((t - sec) * 1000):03d}Z"
+
+
+class _Preview:
+    """
+    Truncated view of a long string, built only when the record is serialised
+    (the formatter's default=str hook calls __str__). __repr__ renders the same
+    text so other formatters and direct readers of the record attribute see it too.
+    """
+
+    __slots__ = ("_text", "_limit")
+
+    def __init__(self, text: str, limit: int) -> None:
+        self._text = text
+        self._limit = limit
+
+    def __str__(self) -> str:
+        text = self._text
+        return (text[: self._limit] + "...") if len(text) > self._limit else text
+
+    __repr__ = __str__
+
+
 def _iso_now() -> str:
-    return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+    return _iso_from_epoch(time.time())
 
 
 def _extract_ticket_id(args: tuple, kwargs: dict) -> str:
@@ -517,3 +643,9 @@ def _extract_ticket_id(args: tuple, kwargs: dict) -> str:
         if isinstance(first, str):
             return first
     return "unknown"
+
+
+# ---------- Module singleton ---------- #
+
+# Built after the helpers above because the init log line already needs _iso_from_epoch
+_global_logger: StructuredLogger = StructuredLogger()
@@ -13,6 +13,7 @@ import base64
 import json
 import logging
 import os
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Dict, List, Optional, Tuple
 
 import boto3
@@ -29,6 +30,7 @@ logger = get_logger()
 AWS_REGION = os.getenv("AWS_REGION") or os.getenv("AWS_DEFAULT_REGION")
 BEDROCK_MODEL = os.getenv("BEDROCK_MODEL", ModelConfiguration.NOVA_LITE_CONFIG["model_id"])
 HTTP_TIMEOUT_SEC = int(os.getenv("HTTP_TIMEOUT_SEC", "30"))  # image download timeout
+MAX_IMAGE_WORKERS = int(os.getenv("MAX_IMAGE_WORKERS", "8"))  # concurrent per-image analyses
 
 
 class NovaLiteAnalyzer:
@@ -171,11 +173,14 @@ Key checks:
                 return self._create_error_analysis("No image URLs provided")
 
             logger.logger.info(f"[nova] Multi-image analysis: {len(image_urls)} image(s)")
-            analyses: List[Dict[str, Any]] = []
-            for idx, url in enumerate(image_urls):
-                single = self.analyze_image_from_url(url, policy_text, ticket_id=ticket_id)
+            # Each image is an independent, IO-bound download + Bedrock call; run them concurrently
+            # (the Bedrock client is thread-safe) and keep results in input order.
+            with ThreadPoolExecutor(max_workers=max(1, min(MAX_IMAGE_WORKERS, len(image_urls)))) as pool:
+                analyses: List[Dict[str, Any]] = list(
+                    pool.map(lambda url: self.analyze_image_from_url(url, policy_text, ticket_id=ticket_id), image_urls)
+                )
+            for idx, single in enumerate(analyses):
                 single["image_index"] = idx
-                analyses.append(single)
 
             return self._combine_analyses(analyses)
 
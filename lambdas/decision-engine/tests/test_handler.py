@@ -0,0 +1,161 @@
+"""
+Regression tests for handler._visual_policy_decision approve paths and the
+SQS batch path (_process_records -> tools.write_results_bulk).
+
+boto3/botocore are stubbed when not installed so tools.py can be imported
+without AWS credentials; no AWS call is made by the code under test.
+"""
+
+import json
+import os
+import sys
+import types
+from unittest import mock
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    import boto3  # noqa: F401
+    import botocore.exceptions  # noqa: F401
+except ImportError:
+    _boto3 = types.ModuleType("boto3")
+    _boto3.resource = mock.MagicMock()
+    _boto3.client = mock.MagicMock()
+    _botocore = types.ModuleType("botocore")
+    _botocore_exceptions = types.ModuleType("botocore.exceptions")
+
+    class ClientError(Exception):
+        pass
+
+    _botocore_exceptions.ClientError = ClientError
+    _botocore.exceptions = _botocore_exceptions
+    sys.modules.update({
+        "boto3": _boto3,
+        "botocore": _botocore,
+        "botocore.exceptions": _botocore_exceptions,
+    })
+
+import handler  # noqa: E402
+import tools  # noqa: E402
+
+
+@pytest.fixture
+def ticket():
+    return {
+        "id": "T-100",
+        "requester_name": "Ada",
+        "title": "Spring sale",
+        "description": "Homepage hero banner",
+        "page_area": "Homepage hero",
+        "page_urls": ["https://logicart.com/sale"],
+        "launch_date": "2025-04-01",
+        "copy_en": "Save 20%",
+        "copy_zh": "",
+        "created_at": "2025-03-01T00:00:00Z",
+        "assets": [],
+    }
+
+
+def _decide(ticket, visual):
+    agent = handler.LogicCartAIAgent()
+    with mock.patch.object(handler, "get_banner_image_url", return_value=None):
+        return agent._visual_policy_decision(ticket, visual, prior_reasons=[])
+
+
+def test_uncertain_but_clean_visual_falls_back_to_approve(ticket):
+    # Borderline quality (0.4-0.5), not compliant-flagged, but brand colour present and no
+    # issues: no NEEDS_INFO reason applies, so the fallback approve branch builds the email
+    visual = {
+        "content_appropriateness": {"appropriate": True, "concerns": []},
+        "visual_quality": {"score": 0.45, "issues": []},
+        "overall_compliance": {"compliant": False, "confidence": 0.5},
+        "colors_detected": ["#5754ff"],
+    }
+
+    result = _decide(ticket, visual)
+
+    assert result["decision"] == "APPROVE"
+    assert result["reasons"] == ["Acceptable quality", "No policy violations detected"]
+    assert result["confidence"] == 0.6
+    assert result["email"]["subject"] == "New Request T-100 - Approved"
+    body = result["email"]["body"]
+    assert body.startswith("Hello Ada,")
+    assert "• Acceptable quality\n• No policy violations detected" in body
+    assert "Impacted Page URL(s): https://logicart.com/sale" in body
+    assert "Request ID: T-100" in body
+
+
+def test_no_brand_alignment_goes_to_needs_info_not_approve(ticket):
+    visual = {
+        "content_appropriateness": {"appropriate": True, "concerns": []},
+        "visual_quality": {"score": 0.45, "issues": []},
+        "overall_compliance": {"compliant": False, "confidence": 0.5},
+        "colors_detected": ["#00FF00"],
+    }
+
+    result = _decide(ticket, visual)
+
+    assert result["decision"] == "NEEDS_INFO"
+    assert result["reasons"] == ["Brand alignment could be enhanced"]
+    assert "Brand alignment could be enhanced" in result["email"]["body"]
+
+
+def test_poor_quality_reject_with_more_than_five_prior_reasons(ticket):
+    # One needs-info reason per flagged URL can already exceed the 5-reason budget
+    prior = [f"URL might be an external redirect: https://bit.ly.logicart.com/{i}" for i in range(6)]
+    visual = {
+        "content_appropriateness": {"appropriate": True, "concerns": []},
+        "visual_quality": {"score": 0.2, "issues": ["blurry edges"]},
+        "overall_compliance": {"compliant": False, "confidence": 0.5},
+        "colors_detected": [],
+    }
+
+    agent = handler.LogicCartAIAgent()
+    with mock.patch.object(handler, "get_banner_image_url", return_value=None):
+        result = agent._visual_policy_decision(ticket, visual, prior_reasons=prior)
+
+    assert result["decision"] == "REJECT"
+    assert result["reasons"] == prior[:5]
+
+
+def _sqs_record(message_id, ticket_id):
+    return {"messageId": message_id, "body": json.dumps({"ticketId": ticket_id})}
+
+
+def test_sqs_batch_reports_failed_writes_and_decisions(ticket):
+    decided = {"decision": "APPROVE", "reasons": ["ok"], "confidence": 0.9}
+
+    def process_request(self, ticket_id, persist=True):
+        assert persist is False
+        if ticket_id == "T-BAD":
+            raise RuntimeError("bedrock down")
+        return dict(decided)
+
+    table = mock.MagicMock()
+
+    def update_item(Key, **kwargs):
+        if Key["ticketId"] == "T-2":
+            raise RuntimeError("throttled")
+
+    table.update_item.side_effect = update_item
+    records = [
+        _sqs_record("m1", "T-1"),
+        _sqs_record("m2", "T-2"),
+        _sqs_record("m3", "T-1"),  # duplicate: decided once, shares T-1's outcome
+        _sqs_record("m4", "T-BAD"),
+        {"messageId": "m5", "body": ""},
+    ]
+
+    with mock.patch.object(handler.LogicCartAIAgent, "process_request", process_request), \
+            mock.patch.object(tools, "_bulk_table", return_value=table), \
+            mock.patch.object(tools, "_send_notification", return_value=True) as send:
+        response = handler.lambda_handler({"Records": records}, None)
+
+    failed = sorted(f["itemIdentifier"] for f in response["batchItemFailures"])
+    assert failed == ["m2", "m4", "m5"]
+    persisted = sorted(c.kwargs["Key"]["ticketId"] for c in table.update_item.call_args_list)
+    # T-1: decision + emailSent; T-2: failed decision write only
+    assert persisted == ["T-1", "T-1", "T-2"]
+    send.assert_called_once_with("T-1", decided)
@@ -20,8 +20,11 @@ from __future__ import annotations
 import json
 import logging
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from decimal import Decimal
-from typing import Any, Dict, Optional, List
+from typing import Any, Dict, Optional, List, Tuple
 
 import boto3
 from botocore.exceptions import ClientError
@@ -44,7 +47,9 @@ UPLOADS_BUCKET = os.getenv("UPLOADS_BUCKET", "")
 SNS_TOPIC_ARN = os.getenv("SNS_TOPIC_ARN", "")
 
 POLICY_DEFAULT_KEY = os.getenv("POLICY_FILE_KEY", "policy.md")
+POLICY_CACHE_TTL = float(os.getenv("POLICY_CACHE_TTL_SEC", "300"))  # seconds before ETag revalidation
 PRESIGNED_URL_TTL = int(os.getenv("PRESIGNED_URL_TTL", "300"))  # seconds
+BULK_WRITE_WORKERS = int(os.getenv("BULK_WRITE_WORKERS", "8"))  # concurrent ticket updates in write_results_bulk
 
 BEDROCK_MODEL = os.getenv("BEDROCK_MODEL", "amazon.nova-lite-v1:0")
 
@@ -55,6 +60,14 @@ _dynamo_resource = boto3.resource("dynamodb", region_name=AWS_REGION) if AWS_REG
 _s3_client = boto3.client("s3", region_name=AWS_REGION) if AWS_REGION else boto3.client("s3")
 _sns_client = boto3.client("sns", region_name=AWS_REGION) if AWS_REGION else boto3.client("sns")
 
+# Policy key -> {"etag", "text", "fetched_at" (monotonic)}; lives for the container's lifetime
+_POLICY_CACHE: Dict[str, Dict[str, Any]] = {}
+
+# write_results_bulk workers. boto3 resources are not thread-safe, so each worker thread keeps
+# its own session-backed Table in _BULK_LOCAL; the pool (and so those Tables) survives warm starts.
+_BULK_POOL: Optional[ThreadPoolExecutor] = None
+_BULK_LOCAL = threading.local()
+
 
 # ------------------------------------------------------------------------------
 # Helpers
@@ -173,19 +186,50 @@ def get_policy(policy_key: str = None) -> str:
     """
     Retrieve policy text from S3. Key defaults to POLICY_FILE_KEY/policy.md.
     """
+    return _fetch_policy(policy_key or POLICY_DEFAULT_KEY)[0]
+
+
+def get_policy_cached(policy_key: str = None) -> str:
+    """
+    Policy text cached in memory per key. Within POLICY_CACHE_TTL the cached text is returned
+    as-is; after that S3 is asked with IfNoneMatch, so an unchanged policy costs a 304, not a transfer.
+    """
     key = policy_key or POLICY_DEFAULT_KEY
+    entry = _POLICY_CACHE.get(key)
+    now = time.monotonic()
+    if entry and now - entry["fetched_at"] < POLICY_CACHE_TTL:
+        return entry["text"]
+
+    fetched = _fetch_policy(key, if_none_match=entry["etag"] if entry else None)
+    if fetched is None:
+        logger.info(f"[tools] Policy {key} not modified; reusing cached text")
+        entry["fetched_at"] = now
+        return entry["text"]
+
+    text, etag = fetched
+    _POLICY_CACHE[key] = {"etag": etag, "text": text, "fetched_at": now}
+    return text
+
+
+def _fetch_policy(key: str, if_none_match: Optional[str] = None) -> Optional[Tuple[str, Optional[str]]]:
+    """GET the policy object; returns (text, etag), or None when If-None-Match reports it unchanged."""
     if not POLICY_BUCKET:
         raise Exception("POLICY_BUCKET is not configured")
 
     try:
         logger.info(f"[tools] Fetch policy from s3://{POLICY_BUCKET}/{key}")
-        resp = _s3_client.get_object(Bucket=POLICY_BUCKET, Key=key)
+        params: Dict[str, Any] = {"Bucket": POLICY_BUCKET, "Key": key}
+        if if_none_match:
+            params["IfNoneMatch"] = if_none_match
+        resp = _s3_client.get_object(**params)
         text = resp["Body"].read().decode("utf-8")
         logger.info(f"[tools] Policy loaded ({len(text)} chars)")
-        return text
+        return text, resp.get("ETag")
 
     except ClientError as e:
         code = e.response.get("Error", {}).get("Code", "Unknown")
+        if if_none_match and code in ("304", "NotModified"):
+            return None
         if code == "NoSuchKey":
             msg = f"Policy file not found: {key}"
         else:
@@ -198,10 +242,13 @@ def get_policy(policy_key: str = None) -> str:
         raise Exception(msg)
 
 
-def write_result(ticket_id: str, result: Dict[str, Any]) -> bool:
+def write_result(ticket_id: str, result: Dict[str, Any], table: Any = None) -> bool:
     """
     Persist the AI decision to DynamoDB and (optionally) notify via SNS.
 
+    The SNS publish (and its emailSent record) only happens once the
+    DynamoDB update has succeeded.
+
     Expected `result` schema:
       {
         "decision": "APPROVE|REJECT|NEEDS_INFO",
@@ -212,79 +259,21 @@ def write_result(ticket_id: str, result: Dict[str, Any]) -> bool:
         "email": { "subject": "...", "body": "..." }   # for NEEDS_INFO/REJECT
         "requester_email": "..."                       # optional for email meta
       }
+
+    `table` is only passed by write_results_bulk (a per-thread Table); by
+    default the module resource is used.
     """
+    decision = result.get("decision")
     try:
-        logger.info(f"[tools] Persist decision for ticket {ticket_id}: {result.get('decision')}")
-
-        table = _dynamo_resource.Table(TICKETS_TABLE)
-
-        # Build update expression
-        expr_vals: Dict[str, Any] = {
-            ":decision": {
-                "decision": result.get("decision"),
-                "reasons": result.get("reasons", []),
-                "confidence": _decimalize(result.get("confidence", 0.0)),
-                "processedAt": result.get("processed_at", ""),
-                "modelUsed": BEDROCK_MODEL,
-                "analysisMethod": result.get("analysis_method", "policy"),
-            },
-            ":updated_at": result.get("processed_at", ""),
-        }
-
-        update_expr_parts = ["agentDecision = :decision", "updatedAt = :updated_at"]
-        expr_names: Dict[str, str] = {}
-
-        # Reflect core status transitions
-        decision = result.get("decision")
-        if decision in ("APPROVE", "REJECT", "NEEDS_INFO"):
-            status_value = (
-                "approved" if decision == "APPROVE"
-                else "rejected" if decision == "REJECT"
-                else "needs_info"
-            )
-            expr_vals[":status"] = status_value
-            expr_names["#status"] = "status"
-            update_expr_parts.append("#status = :status")
-
-        update_expr = "SET " + ", ".join(update_expr_parts)
-
-        # Build params without passing None for ExpressionAttributeNames
-        params = {
-            "Key": {"ticketId": ticket_id},
-            "UpdateExpression": update_expr,
-            "ExpressionAttributeValues": expr_vals,
-        }
-        if expr_names:
-            params["ExpressionAttributeNames"] = expr_names
-
-        table.update_item(**params)
+        logger.info(f"[tools] Persist decision for ticket {ticket_id}: {decision}")
+        if table is None:
+            table = _dynamo_resource.Table(TICKETS_TABLE)
+        _put_dynamo(table, ticket_id, result)
         logger.info(f"[tools] DynamoDB updated for {ticket_id}")
 
-        # Send SNS notification for ALL decision statuses
+        # Send SNS notification for ALL decision statuses (only for stored decisions)
         if decision in ("APPROVE", "REJECT", "NEEDS_INFO"):
-            notified = _send_notification(ticket_id, result)
-            if notified:
-                # save emailSent metadata (non-critical)
-                email_subject = ""
-                if result.get("email"):
-                    email_subject = result["email"].get("subject", "")
-                else:
-                    # Generate default subject for APPROVE status
-                    email_subject = f"LogicCart Request Update: {ticket_id}"
-                
-                table.update_item(
-                    Key={"ticketId": ticket_id},
-                    UpdateExpression="SET emailSent = :email_sent",
-                    ExpressionAttributeValues={
-                        ":email_sent": {
-                            "sentAt": result.get("processed_at", ""),
-                            "subject": email_subject,
-                            "recipient": result.get("requester_email", ""),
-                            "status": decision,
-                        }
-                    },
-                )
-                logger.info(f"[tools] Notification sent and recorded for {ticket_id} (status: {decision})")
+            _publish_sns(table, ticket_id, result)
 
         return True
 
@@ -296,6 +285,120 @@ def write_result(ticket_id: str, result: Dict[str, Any]) -> bool:
         return False
 
 
+def write_results_bulk(results: List[Tuple[str, Dict[str, Any]]]) -> Dict[str, bool]:
+    """
+    Persist several decisions at once (queue-driven invocations).
+
+    Each ticket is a partial UpdateItem, which BatchWriteItem cannot express
+    (it only does whole-item Put/Delete and would overwrite the ticket), so
+    the per-ticket writes are fanned out over a thread pool instead.
+    Returns ticket_id -> write_result outcome.
+    """
+    if not results:
+        return {}
+    global _BULK_POOL
+    if _BULK_POOL is None:
+        _BULK_POOL = ThreadPoolExecutor(max_workers=max(1, BULK_WRITE_WORKERS), thread_name_prefix="tools-bulk")
+    outcomes = list(_BULK_POOL.map(lambda item: write_result(item[0], item[1], table=_bulk_table()), results))
+    return {ticket_id: ok for (ticket_id, _), ok in zip(results, outcomes)}
+
+
+def _bulk_table() -> Any:
+    """This worker thread's own Table (boto3 resources must not be shared across threads)."""
+    table = getattr(_BULK_LOCAL, "table", None)
+    if table is None:
+        session = boto3.session.Session()
+        resource = session.resource("dynamodb", region_name=AWS_REGION) if AWS_REGION else session.resource("dynamodb")
+        table = _BULK_LOCAL.table = resource.Table(TICKETS_TABLE)
+    return table
+
+
+def _put_dynamo(table: Any, ticket_id: str, result: Dict[str, Any]) -> None:
+    """
+    Write agentDecision/updatedAt (and status for known decisions). Synchronous:
+    the caller only reports success once this is durable.
+    """
+    # Build update expression
+    expr_vals: Dict[str, Any] = {
+        ":decision": {
+            "decision": result.get("decision"),
+            "reasons": result.get("reasons", []),
+            "confidence": _decimalize(result.get("confidence", 0.0)),
+            "processedAt": result.get("processed_at", ""),
+            "modelUsed": BEDROCK_MODEL,
+            "analysisMethod": result.get("analysis_method", "policy"),
+        },
+        ":updated_at": result.get("processed_at", ""),
+    }
+
+    update_expr_parts = ["agentDecision = :decision", "updatedAt = :updated_at"]
+    expr_names: Dict[str, str] = {}
+
+    # Reflect core status transitions
+    decision = result.get("decision")
+    if decision in ("APPROVE", "REJECT", "NEEDS_INFO"):
+        status_value = (
+            "approved" if decision == "APPROVE"
+            else "rejected" if decision == "REJECT"
+            else "needs_info"
+        )
+        expr_vals[":status"] = status_value
+        expr_names["#status"] = "status"
+        update_expr_parts.append("#status = :status")
+
+    update_expr = "SET " + ", ".join(update_expr_parts)
+
+    # Build params without passing None for ExpressionAttributeNames
+    params = {
+        "Key": {"ticketId": ticket_id},
+        "UpdateExpression": update_expr,
+        "ExpressionAttributeValues": expr_vals,
+    }
+    if expr_names:
+        params["ExpressionAttributeNames"] = expr_names
+
+    table.update_item(**params)
+
+
+def _publish_sns(table: Any, ticket_id: str, result: Dict[str, Any]) -> bool:
+    """
+    Publish via SNS, then record emailSent (non-critical). Never raises.
+    """
+    try:
+        if not _send_notification(ticket_id, result):
+            return False
+        _record_email_sent(table, ticket_id, result)
+        logger.info(f"[tools] Notification sent and recorded for {ticket_id} (status: {result.get('decision')})")
+        return True
+    except Exception as e:
+        logger.error(f"SNS background publish error for {ticket_id}: {e}")
+        return False
+
+
+def _record_email_sent(table: Any, ticket_id: str, result: Dict[str, Any]) -> None:
+    """
+    Save emailSent metadata (non-critical) after a successful publish.
+    """
+    if result.get("email"):
+        email_subject = result["email"].get("subject", "")
+    else:
+        # Generate default subject for APPROVE status
+        email_subject = f"LogicCart Request Update: {ticket_id}"
+
+    table.update_item(
+        Key={"ticketId": ticket_id},
+        UpdateExpression="SET emailSent = :email_sent",
+        ExpressionAttributeValues={
+            ":email_sent": {
+                "sentAt": result.get("processed_at", ""),
+                "subject": email_subject,
+                "recipient": result.get("requester_email", ""),
+                "status": result.get("decision"),
+            }
+        },
+    )
+
+
 def get_banner_image_url(s3_key: str) -> Optional[str]:
     """
     Generate a presigned URL for a banner asset in UPLOADS_BUCKET.